@@ -3,8 +3,9 @@
 const WIDTH = 64;
 const HEIGHT = 32;
 
-function createBlankPixels() {
-  return Array.from({ length: WIDTH * HEIGHT }, () => '#000000');
+// Pixel art is stored as packed RGB (3 bytes per cell, row-major), base64 encoded.
+function createBlankPixels(width = WIDTH, height = HEIGHT) {
+  return Buffer.alloc(width * height * 3).toString('base64');
 }
 
 const defaultState = {
@@ -27,17 +28,10 @@ const defaultState = {
         icon: 'sun',
         temp: '--'
       },
+      // Events live in the calendar store (services/calendarStore.js), not in state.
       calendar: {
         enabled: true,
-        selectedDate: '',
-        events: [
-          {
-            date: '2026-02-14',
-            time: '19:00',
-            title: 'Date Night',
-            source: 'manual'
-          }
-        ]
+        selectedDate: ''
       },
       todo: {
         enabled: true,
@@ -68,7 +62,20 @@ const defaultState = {
       dayStart: '11:00',
       brightness: 40
     },
+    // Applied by the renderer in every mode: brightness ramps into each level over
+    // rampMinutes, and the panel is switched off inside blank windows.
+    powerProfile: {
+      enabled: false,
+      rampMinutes: 30,
+      levels: [
+        { time: '07:00', brightness: 70 },
+        { time: '21:00', brightness: 25 }
+      ],
+      blank: [{ start: '01:00', end: '06:30' }]
+    },
     pixels: {
+      width: WIDTH,
+      height: HEIGHT,
       data: createBlankPixels(),
       background: '#000000'
     }
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Startup benchmark for remote_display.py: process launch through first frame.
+
+Runs the renderer once per mode to warm the .pyc cache, then --runs more
+times, and reports the median wall time of the whole process and the
+renderer's own launcher-to-first-swap time. Exits non-zero when any mode's
+median is over --target-ms, so it can be run on the Pi after an update to
+catch startup regressions.
+
+By default the renderer runs headless, which needs no rgbmatrix but also
+never imports it or builds RGBMatrix(), usually the slowest part on a Pi.
+--device drives the real panel instead (run it with sudo if the renderer
+needs it) and times launcher start to the first real SwapOnVSync, read back
+from the renderer's stats file; wall time is not reported there because the
+process keeps running until it is stopped.
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RENDERER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'remote_display.py')
+
+# Budget for a Raspberry Pi 3 class board; a desktop should come in far below it.
+DEFAULT_TARGET_MS = 300
+
+BENCH_PAYLOADS = {
+    'clock': {'mode': 'clock'},
+    'widgets': {
+        'mode': 'widgets',
+        'widgets': {
+            'weather': {'temp': '5', 'unit': 'C', 'icon': 'sun'},
+            'calendar': {'events': []},
+            'todo': {'items': [{'text': 'Buy flowers'}]},
+        },
+    },
+    'message': {'mode': 'message', 'message': {'text': 'Hi gorgeous <3', 'effect': 'scroll'}},
+    'animation': {'mode': 'animation', 'animation': {'preset': 'rainbowWave'}},
+    'valentine': {'mode': 'valentine', 'valentine': {'fireworks': True}},
+    'pixels': {'mode': 'pixels', 'pixels': {'width': 64, 'height': 32, 'data': ''}},
+}
+
+
+def run_once(python, payload):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [python, RENDERER, '--headless', '--stdin', '--frames', '1', '--format', 'rgb'],
+        input=json.dumps(payload).encode('utf-8'),
+        capture_output=True,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000.0
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode('utf-8', 'replace').strip() or f'exit {result.returncode}')
+    return wall_ms, json.loads(result.stdout).get('startupMs')
+
+
+def run_on_device(python, payload, settle_seconds):
+    handle, stats_path = tempfile.mkstemp(prefix='lrdigiboard-bench-', suffix='.json')
+    os.close(handle)
+    os.remove(stats_path)
+    try:
+        process = subprocess.Popen(
+            [python, RENDERER, '--runner', '--stdin', '--stats-file', stats_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        process.stdin.write(json.dumps(payload).encode('utf-8'))
+        process.stdin.close()
+        time.sleep(settle_seconds)
+        # The renderer flushes its stats, including startupMs, when it is stopped.
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=10)
+        stderr = process.stderr.read()
+        try:
+            with open(stats_path, 'r', encoding='utf-8') as stats_file:
+                stats = json.load(stats_file)
+        except (OSError, ValueError):
+            message = stderr.decode('utf-8', 'replace').strip()
+            raise RuntimeError(message or f'no stats written (exit {process.returncode})') from None
+        return None, stats['modes'][payload['mode']].get('startupMs')
+    finally:
+        if os.path.exists(stats_path):
+            os.remove(stats_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure remote_display.py startup per mode')
+    parser.add_argument('--runs', type=int, default=7, help='Timed runs per mode after one warm-up run')
+    parser.add_argument('--target-ms', type=float, default=DEFAULT_TARGET_MS, help='Median wall-time budget per mode')
+    parser.add_argument('--python', default=sys.executable, help='Interpreter to launch the renderer with')
+    parser.add_argument('--mode', action='append', choices=sorted(BENCH_PAYLOADS), help='Limit to these modes')
+    parser.add_argument('--device', action='store_true', help='Drive the real panel through rgbmatrix, not headless')
+    parser.add_argument('--settle', type=float, default=1.5, help='Seconds each --device run shows before it is stopped')
+    args = parser.parse_args()
+
+    if args.device:
+        measure = lambda payload: run_on_device(args.python, payload, max(0.2, args.settle))  # noqa: E731
+    else:
+        measure = lambda payload: run_once(args.python, payload)  # noqa: E731
+
+    failed = []
+    print(f"{'mode':<10} {'wall ms':>9} {'first frame ms':>15}")
+    for mode in args.mode or list(BENCH_PAYLOADS):
+        payload = {'brightness': 70, 'matrixOptions': {}, **BENCH_PAYLOADS[mode]}
+        measure(payload)
+        samples = [measure(payload) for _ in range(max(1, args.runs))]
+        first_frame = statistics.median(sample[1] or 0.0 for sample in samples)
+        if args.device:
+            print(f"{mode:<10} {'-':>9} {first_frame:>15.1f}")
+            over = first_frame > args.target_ms
+        else:
+            wall = statistics.median(sample[0] for sample in samples)
+            print(f'{mode:<10} {wall:>9.1f} {first_frame:>15.1f}')
+            over = wall > args.target_ms
+        if over:
+            failed.append(mode)
+
+    if failed:
+        print(f"Over the {args.target_ms:.0f} ms target: {', '.join(failed)}")
+        sys.exit(1)
+    print(f'All modes within the {args.target_ms:.0f} ms target.')
+
+
+if __name__ == '__main__':
+    main()
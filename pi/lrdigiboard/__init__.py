@@ -0,0 +1 @@
+"""Renderer modules for remote_display.py, imported per mode so startup only pays for what runs."""
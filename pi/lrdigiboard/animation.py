@@ -0,0 +1,115 @@
+"""Animation presets: rainbow wave, heart beat, sparkles and colour wipe."""
+
+import math
+import random
+
+from .particles import ParticlePool
+from .runtime import PULSE_LOOP_FRAMES, clamp, run_scene
+
+
+# Colour for every hue the wave can show, built once when animation mode loads.
+RAINBOW_LUT = tuple(
+    (
+        int((math.sin(math.radians(hue)) + 1) * 127),
+        int((math.sin(math.radians(hue + 120)) + 1) * 127),
+        int((math.sin(math.radians(hue + 240)) + 1) * 127),
+    )
+    for hue in range(360)
+)
+
+
+def draw_rainbow_wave(canvas, phase):
+    set_pixel = canvas.SetPixel
+    offset = int(phase * 40)
+    for y in range(canvas.height):
+        row_offset = y * 5 + offset
+        for x in range(canvas.width):
+            r, g, b = RAINBOW_LUT[(x * 3 + row_offset) % 360]
+            set_pixel(x, y, r, g, b)
+
+
+def draw_heart(canvas, phase):
+    pulse = 0.6 + (math.sin(phase * 2.0) + 1.0) * 0.2
+    canvas.Fill(0, 0, 0)
+
+    scale = 0.16 * pulse
+    for px in range(canvas.width):
+        for py in range(canvas.height):
+            x = (px - canvas.width / 2) * scale
+            y = (py - canvas.height / 2) * scale
+            value = (x * x + y * y - 1) ** 3 - x * x * y * y * y
+            if value <= 0:
+                intensity = max(0, min(255, int(140 + 115 * pulse)))
+                canvas.SetPixel(px, py, intensity, 20, 60)
+
+
+def spawn_sparkle(pool, width, height, life):
+    pool.emit(random.randint(0, width - 1), random.randint(0, height - 1), 0.0, 0.0, life, (255, 255, 255))
+
+
+def draw_sparkles(canvas, pool):
+    canvas.Fill(0, 0, 0)
+    pool.update()
+    while pool.count < pool.capacity:
+        spawn_sparkle(pool, canvas.width, canvas.height, random.randint(4, 14))
+    pool.draw(canvas)
+
+
+def draw_color_wipe(canvas, step):
+    palette = [(255, 30, 60), (30, 230, 120), (40, 130, 255), (240, 220, 30)]
+    color = palette[(step // canvas.width) % len(palette)]
+    cutoff = step % canvas.width
+
+    for y in range(canvas.height):
+        for x in range(canvas.width):
+            if x <= cutoff:
+                canvas.SetPixel(x, y, color[0], color[1], color[2])
+            else:
+                canvas.SetPixel(x, y, 0, 0, 0)
+
+
+class AnimationScene:
+    """One animation preset; render() draws a frame, advances the preset and returns its delay."""
+
+    def __init__(self, width, height, payload):
+        config = payload.get('animation', {})
+        self.preset = str(config.get('preset') or 'rainbowWave')
+        speed = clamp(config.get('speed'), 10, 100, 35)
+        self.frame_delay = max(0.02, 0.16 - (speed / 100.0) * 0.13)
+        self.step = 0
+
+        # rainbowWave shifts hue 6 degrees a frame (360/6 frames); colorWipe cycles four
+        # colours across the width; heartBeat uses a closed pulse loop. Sparkles are random.
+        self.phase_step = 0.15
+        if self.preset == 'heartBeat':
+            self.phase_step = math.pi / PULSE_LOOP_FRAMES
+            self.period = PULSE_LOOP_FRAMES
+        elif self.preset == 'colorWipe':
+            self.period = 4 * width
+        elif self.preset == 'sparkles':
+            self.period = None
+        else:
+            self.period = 60
+        self.loop_key = f'animation:{self.preset}:{speed}:{width}x{height}'
+
+        self.sparkles = ParticlePool(max(8, (width * height) // 16))
+        for _ in range(self.sparkles.capacity):
+            spawn_sparkle(self.sparkles, width, height, random.randint(3, 12))
+
+    def render(self, canvas):
+        phase = self.step * self.phase_step
+        if self.preset == 'heartBeat':
+            draw_heart(canvas, phase)
+        elif self.preset == 'sparkles':
+            draw_sparkles(canvas, self.sparkles)
+        elif self.preset == 'colorWipe':
+            draw_color_wipe(canvas, self.step)
+        else:
+            draw_rainbow_wave(canvas, phase)
+
+        self.step += 1
+        return self.frame_delay
+
+
+def run_animation(matrix, payload):
+    run_scene(matrix, AnimationScene(matrix.width, matrix.height, payload))
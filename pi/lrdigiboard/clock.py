@@ -0,0 +1,30 @@
+"""Night clock mode."""
+
+from datetime import datetime
+
+from . import runtime
+from .drawing import clear, draw_text_scaled, scaled_text_width
+from .runtime import layout_scale, present
+
+
+def run_clock(matrix, payload):
+    scale = 4 * layout_scale(matrix.width, matrix.height)
+    gap = 1
+    color = (255, 90, 90)
+
+    canvas = matrix.CreateFrameCanvas()
+
+    while runtime.RUNNING:
+        clear(canvas)
+
+        now = datetime.now()
+        time_text = f"{now.hour:02d}:{now.minute:02d}"
+        text_width = scaled_text_width(time_text, scale, gap)
+        text_height = 5 * scale
+        text_x = max(0, (matrix.width - text_width) // 2)
+        text_y = max(0, (matrix.height - text_height) // 2)
+
+        draw_text_scaled(canvas, text_x, text_y, time_text, color, scale, gap)
+
+        # Only HH:MM is shown, so wake once a minute, just after it turns over.
+        canvas = present(matrix, canvas, 60.05 - now.second - now.microsecond / 1e6)
@@ -0,0 +1,215 @@
+"""Bitmap font, colour helpers and pixel primitives shared by every mode."""
+
+
+FONT_3X5 = {
+    ' ': ['000', '000', '000', '000', '000'],
+    'A': ['010', '101', '111', '101', '101'],
+    'B': ['110', '101', '110', '101', '110'],
+    'C': ['011', '100', '100', '100', '011'],
+    'D': ['110', '101', '101', '101', '110'],
+    'E': ['111', '100', '110', '100', '111'],
+    'F': ['111', '100', '110', '100', '100'],
+    'G': ['011', '100', '101', '101', '011'],
+    'H': ['101', '101', '111', '101', '101'],
+    'I': ['111', '010', '010', '010', '111'],
+    'J': ['111', '001', '001', '101', '010'],
+    'K': ['101', '101', '110', '101', '101'],
+    'L': ['100', '100', '100', '100', '111'],
+    'M': ['101', '111', '111', '101', '101'],
+    'N': ['101', '111', '111', '111', '101'],
+    'O': ['010', '101', '101', '101', '010'],
+    'P': ['110', '101', '110', '100', '100'],
+    'Q': ['010', '101', '101', '111', '011'],
+    'R': ['110', '101', '110', '101', '101'],
+    'S': ['011', '100', '010', '001', '110'],
+    'T': ['111', '010', '010', '010', '010'],
+    'U': ['101', '101', '101', '101', '111'],
+    'V': ['101', '101', '101', '101', '010'],
+    'W': ['101', '101', '111', '111', '101'],
+    'X': ['101', '101', '010', '101', '101'],
+    'Y': ['101', '101', '010', '010', '010'],
+    'Z': ['111', '001', '010', '100', '111'],
+    '0': ['111', '101', '101', '101', '111'],
+    '1': ['010', '110', '010', '010', '111'],
+    '2': ['110', '001', '010', '100', '111'],
+    '3': ['110', '001', '010', '001', '110'],
+    '4': ['101', '101', '111', '001', '001'],
+    '5': ['111', '100', '110', '001', '110'],
+    '6': ['011', '100', '110', '101', '010'],
+    '7': ['111', '001', '010', '100', '100'],
+    '8': ['010', '101', '010', '101', '010'],
+    '9': ['010', '101', '011', '001', '110'],
+    '.': ['000', '000', '000', '000', '010'],
+    ',': ['000', '000', '000', '010', '100'],
+    ':': ['000', '010', '000', '010', '000'],
+    ';': ['000', '010', '000', '010', '100'],
+    '!': ['010', '010', '010', '000', '010'],
+    '?': ['110', '001', '010', '000', '010'],
+    '-': ['000', '000', '111', '000', '000'],
+    '+': ['000', '010', '111', '010', '000'],
+    '/': ['001', '001', '010', '100', '100'],
+    '[': ['110', '100', '100', '100', '110'],
+    ']': ['011', '001', '001', '001', '011'],
+    '(': ['010', '100', '100', '100', '010'],
+    ')': ['010', '001', '001', '001', '010'],
+    '<': ['001', '010', '100', '010', '001'],
+    '>': ['100', '010', '001', '010', '100'],
+    '#': ['101', '111', '101', '111', '101'],
+    '_': ['000', '000', '000', '000', '111']
+}
+
+
+def hex_to_rgb(value):
+    text = str(value or '').strip()
+    if len(text) != 7 or not text.startswith('#'):
+        return (255, 255, 255)
+
+    try:
+        return (
+            int(text[1:3], 16),
+            int(text[3:5], 16),
+            int(text[5:7], 16),
+        )
+    except ValueError:
+        return (255, 255, 255)
+
+
+def scale_color(color, factor):
+    return (
+        max(0, min(255, int(color[0] * factor))),
+        max(0, min(255, int(color[1] * factor))),
+        max(0, min(255, int(color[2] * factor))),
+    )
+
+
+def clear(canvas):
+    canvas.Fill(0, 0, 0)
+
+
+def draw_pixel(canvas, x, y, color):
+    if 0 <= x < canvas.width and 0 <= y < canvas.height:
+        canvas.SetPixel(x, y, color[0], color[1], color[2])
+
+
+def draw_hline(canvas, x1, x2, y, color):
+    for x in range(x1, x2 + 1):
+        draw_pixel(canvas, x, y, color)
+
+
+def draw_vline(canvas, x, y1, y2, color):
+    for y in range(y1, y2 + 1):
+        draw_pixel(canvas, x, y, color)
+
+
+# Lit (dx, dy) offsets per glyph, so drawing never re-parses the '010' rows.
+GLYPH_PIXELS = {
+    char: tuple(
+        (col_index, row_index)
+        for row_index, row in enumerate(rows)
+        for col_index, bit in enumerate(row)
+        if bit == '1'
+    )
+    for char, rows in FONT_3X5.items()
+}
+
+
+def glyph_pixels(char):
+    return GLYPH_PIXELS.get(char.upper(), GLYPH_PIXELS[' '])
+
+
+def draw_char(canvas, x, y, char, color):
+    for dx, dy in glyph_pixels(char):
+        draw_pixel(canvas, x + dx, y + dy, color)
+
+
+def draw_text(canvas, x, y, text, color):
+    cursor = x
+    for char in text:
+        draw_char(canvas, cursor, y, char, color)
+        cursor += 4
+
+
+def draw_char_scaled(canvas, x, y, char, color, scale=2):
+    for col_index, row_index in glyph_pixels(char):
+        for dy in range(scale):
+            for dx in range(scale):
+                draw_pixel(canvas, x + col_index * scale + dx, y + row_index * scale + dy, color)
+
+
+def draw_text_scaled(canvas, x, y, text, color, scale=2, gap=1):
+    cursor = x
+    for char in text:
+        draw_char_scaled(canvas, cursor, y, char, color, scale)
+        cursor += 3 * scale + gap
+
+
+def scaled_text_width(text, scale=2, gap=1):
+    raw = str(text or '')
+    if not raw:
+        return 0
+    return len(raw) * (3 * scale) + (len(raw) - 1) * gap
+
+
+def draw_text_todo(canvas, x, y, text, color, space_advance=1):
+    cursor = x
+    for char in str(text or ''):
+        if char == ' ':
+            cursor += space_advance
+            continue
+        draw_char(canvas, cursor, y, char, color)
+        cursor += 4
+
+
+def text_width(text):
+    return len(str(text or '')) * 4
+
+
+def drawn_text_width(text, advance=4):
+    raw = str(text or '')
+    if not raw:
+        return 0
+    return len(raw) * advance - 1
+
+
+def draw_text_compact(canvas, x, y, text, color):
+    cursor = x
+    for char in text:
+        draw_char(canvas, cursor, y, char, color)
+        cursor += 3
+
+
+def compact_text_width(text):
+    return len(str(text or '')) * 3
+
+
+def wrap_text(text, max_chars, max_lines):
+    words = str(text or '').split()
+    if not words:
+        return []
+
+    lines = []
+    current = ''
+
+    for word in words:
+        if len(word) > max_chars:
+            word = word[:max_chars]
+
+        if not current:
+            current = word
+            continue
+
+        trial = f'{current} {word}'
+        if len(trial) <= max_chars:
+            current = trial
+            continue
+
+        lines.append(current)
+        current = word
+
+        if len(lines) >= max_lines:
+            return lines[:max_lines]
+
+    if current and len(lines) < max_lines:
+        lines.append(current)
+
+    return lines[:max_lines]
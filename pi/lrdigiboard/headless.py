@@ -0,0 +1,44 @@
+"""Headless output: captured frames as PNG or raw RGB on stdout."""
+
+import base64
+import json
+import struct
+import sys
+import zlib
+
+
+def encode_png(width, height, rgb):
+    stride = width * 3
+    raw = b''.join(b'\x00' + rgb[row * stride:(row + 1) * stride] for row in range(height))
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xFFFFFFFF)
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(raw, 6)),
+        chunk(b'IEND', b''),
+    ])
+
+
+def write_headless_output(matrix, output_format):
+    if output_format == 'rgb':
+        frames = [base64.b64encode(frame).decode('ascii') for frame in matrix.frames]
+    else:
+        frames = [
+            base64.b64encode(encode_png(matrix.width, matrix.height, frame)).decode('ascii')
+            for frame in matrix.frames
+        ]
+
+    json.dump({
+        'width': matrix.width,
+        'height': matrix.height,
+        'format': output_format,
+        'delays': matrix.delays,
+        'startupMs': matrix.startup_ms,
+        'frames': frames,
+    }, sys.stdout, separators=(',', ':'))
+    sys.stdout.write('\n')
+    sys.stdout.flush()
@@ -0,0 +1,54 @@
+"""Full-screen message mode."""
+
+import math
+
+from .drawing import clear, draw_text, hex_to_rgb, scale_color, text_width
+from .runtime import PULSE_LOOP_FRAMES, clamp, layout_scale, layout_view, run_scene
+
+
+class MessageScene:
+    """Scrolling, static or pulsing text; every effect repeats, so period is always set."""
+
+    def __init__(self, width, height, payload):
+        config = payload.get('message', {})
+        self.message = str(config.get('text') or 'HELLO')
+        self.effect = str(config.get('effect') or 'scroll')
+        speed = clamp(config.get('speed'), 10, 100, 35)
+        self.color = hex_to_rgb(config.get('color'))
+        self.frame_delay = max(0.015, 0.14 - (speed / 100.0) * 0.11)
+
+        self.scale = layout_scale(width, height)
+        self.width = width // self.scale
+        self.text_y = max(0, (height // self.scale - 5) // 2)
+        self.text_total_width = text_width(self.message)
+        self.frame = 0
+
+        if self.effect == 'static':
+            self.period = 2
+        elif self.effect == 'pulse':
+            self.period = PULSE_LOOP_FRAMES
+        else:
+            self.period = self.width + self.text_total_width + 1
+        self.loop_key = f"message:{self.effect}:{speed}:{config.get('color')}:{self.message}:{width}x{height}"
+
+    def render(self, canvas):
+        clear(canvas)
+        view = layout_view(canvas, self.scale)
+        centered_x = (self.width - self.text_total_width) // 2
+
+        if self.effect == 'static':
+            draw_text(view, centered_x, self.text_y, self.message, self.color)
+        elif self.effect == 'pulse':
+            pulse_phase = (self.frame % PULSE_LOOP_FRAMES + 1) * (2.0 * math.pi / PULSE_LOOP_FRAMES)
+            factor = 0.35 + (math.sin(pulse_phase) + 1.0) * 0.325
+            draw_text(view, centered_x, self.text_y, self.message, scale_color(self.color, factor))
+        else:
+            scroll_x = self.width - self.frame % self.period
+            draw_text(view, scroll_x, self.text_y, self.message, self.color)
+
+        self.frame += 1
+        return self.frame_delay
+
+
+def run_message(matrix, payload):
+    run_scene(matrix, MessageScene(matrix.width, matrix.height, payload))
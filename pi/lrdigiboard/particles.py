@@ -0,0 +1,109 @@
+"""Fixed-capacity particle storage used by fireworks and sparkles."""
+
+import math
+from array import array
+
+
+# Unit vectors for burst directions, computed once instead of per frame.
+BURST_DIRECTIONS = tuple(
+    (math.cos(math.radians(step)), math.sin(math.radians(step)))
+    for step in range(0, 360, 30)
+)
+
+
+class ParticlePool:
+    """Fixed-capacity particle storage kept as parallel arrays.
+
+    Live particles are packed into [0, count); update() swaps dead ones out
+    so draw() never has to skip holes.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self.count = 0
+        self.x = array('f', [0.0]) * self.capacity
+        self.y = array('f', [0.0]) * self.capacity
+        self.vx = array('f', [0.0]) * self.capacity
+        self.vy = array('f', [0.0]) * self.capacity
+        self.life = array('H', [0]) * self.capacity
+        self.max_life = array('H', [0]) * self.capacity
+        self.r = array('B', [0]) * self.capacity
+        self.g = array('B', [0]) * self.capacity
+        self.b = array('B', [0]) * self.capacity
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, vx, vy, life, color):
+        if self.count >= self.capacity:
+            return False
+
+        index = self.count
+        life = max(1, min(65535, int(life)))
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.life[index] = life
+        self.max_life[index] = life
+        self.r[index] = color[0]
+        self.g[index] = color[1]
+        self.b[index] = color[2]
+        self.count = index + 1
+        return True
+
+    def burst(self, x, y, speed, life, color, directions=BURST_DIRECTIONS, offset=0.0):
+        for dx, dy in directions:
+            self.emit(x + dx * offset, y + dy * offset, dx * speed, dy * speed, life, color)
+
+    def _move(self, source, target):
+        for column in (self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.r, self.g, self.b):
+            column[target] = column[source]
+
+    def update(self, gravity=0.0, drag=1.0):
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        count = self.count
+        index = 0
+
+        while index < count:
+            remaining = life[index] - 1
+            if remaining <= 0:
+                count -= 1
+                if index != count:
+                    self._move(count, index)
+                continue
+
+            life[index] = remaining
+            next_vx = vx[index] * drag
+            next_vy = vy[index] * drag + gravity
+            vx[index] = next_vx
+            vy[index] = next_vy
+            x[index] += next_vx
+            y[index] += next_vy
+            index += 1
+
+        self.count = count
+
+    def draw(self, canvas, min_fade=0.0, trail_after=0, trail_steps=0.0, trail_fade=0.7):
+        width = canvas.width
+        height = canvas.height
+        set_pixel = canvas.SetPixel
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        life, max_life, r, g, b = self.life, self.max_life, self.r, self.g, self.b
+
+        for index in range(self.count):
+            fade = life[index] / max_life[index]
+            if fade < min_fade:
+                fade = min_fade
+
+            if trail_steps and max_life[index] - life[index] >= trail_after:
+                tx = int(round(x[index] - vx[index] * trail_steps))
+                ty = int(round(y[index] - vy[index] * trail_steps))
+                if 0 <= tx < width and 0 <= ty < height:
+                    tail = fade * trail_fade
+                    set_pixel(tx, ty, int(r[index] * tail), int(g[index] * tail), int(b[index] * tail))
+
+            px = int(round(x[index]))
+            py = int(round(y[index]))
+            if 0 <= px < width and 0 <= py < height:
+                set_pixel(px, py, int(r[index] * fade), int(g[index] * fade), int(b[index] * fade))
@@ -0,0 +1,134 @@
+"""Worker-process render pipeline for heavy scenes on multi-core Pis."""
+
+import multiprocessing
+import os
+import queue
+import time
+
+from . import runtime
+from .runtime import HeadlessCanvas, draw_framebuffer, present
+
+
+def produce(scene, ring_array, free, ready, width, height):
+    """Worker loop: render into whichever ring slot is free and hand it back with its delay."""
+    frame_size = width * height * 3
+    parent = os.getppid()
+    ring = memoryview(ring_array).cast('B')
+    while runtime.RUNNING and os.getppid() == parent:
+        try:
+            slot = free.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        canvas = HeadlessCanvas(width, height, ring[slot * frame_size:(slot + 1) * frame_size])
+        ready.put((slot, scene.render(canvas)))
+
+
+class FramePipeline:
+    """Renders scene frames in a worker process into a shared-memory ring.
+
+    The main loop only copies the oldest ready frame into the matrix canvas and
+    swaps. Free slots are the back-pressure: the worker blocks once it is
+    ring_size frames ahead. When the main loop falls a whole frame behind and a
+    newer frame is waiting, the stale one is dropped instead of shown late.
+
+    The worker is spawned, not forked: by the time a scene runs, RGBMatrix has
+    started its realtime refresh thread and claimed the GPIO pins, and a forked
+    child would inherit both. A spawned worker starts from a fresh interpreter
+    and only receives the pickled scene.
+    """
+
+    def __init__(self, scene, width, height, ring_size):
+        context = multiprocessing.get_context('spawn')
+        self.width = width
+        self.height = height
+        self.ring_size = ring_size
+        self.frame_size = width * height * 3
+        self.ring = context.RawArray('B', self.frame_size * ring_size)
+        self.free = context.Queue()
+        self.ready = context.Queue()
+        for slot in range(ring_size):
+            self.free.put(slot)
+
+        self.frames = 0
+        self.dropped = 0
+        self.stalls = 0
+
+        try:
+            from PIL import Image  # type: ignore
+        except ImportError:
+            Image = None
+        self.image = Image
+
+        self.worker = context.Process(
+            target=produce,
+            args=(scene, self.ring, self.free, self.ready, width, height),
+            daemon=True,
+        )
+        self.worker.start()
+
+    def slot_view(self, ring, slot):
+        start = slot * self.frame_size
+        return ring[start:start + self.frame_size]
+
+    def blit(self, canvas, frame):
+        if self.image is not None and hasattr(canvas, 'SetImage'):
+            canvas.SetImage(self.image.frombytes('RGB', (self.width, self.height), bytes(frame)))
+            return
+        draw_framebuffer(canvas, frame, self.width, (0, 0, self.width, self.height))
+
+    def next_frame(self, due):
+        """Return (slot, delay, due) for the frame to show next, dropping any we are too late for."""
+        try:
+            slot, delay = self.ready.get_nowait()
+        except queue.Empty:
+            if due is not None and time.monotonic() > due:
+                self.stalls += 1
+            slot, delay = self.ready.get(timeout=0.5)
+
+        if due is None:
+            # Pacing starts with the first frame; the worker's interpreter start-up is not a stall.
+            return slot, delay, time.monotonic()
+
+        while time.monotonic() > due + delay:
+            try:
+                newer = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            self.free.put(slot)
+            self.dropped += 1
+            due += delay
+            slot, delay = newer
+
+        return slot, delay, due
+
+    def run(self, matrix):
+        ring = memoryview(self.ring).cast('B')
+        canvas = matrix.CreateFrameCanvas()
+        due = None
+
+        while runtime.RUNNING:
+            try:
+                slot, delay, due = self.next_frame(due)
+            except queue.Empty:
+                continue
+
+            self.blit(canvas, self.slot_view(ring, slot))
+            self.free.put(slot)
+            self.frames += 1
+            if runtime.STATS is not None:
+                runtime.STATS.pipeline = {
+                    'ring': self.ring_size,
+                    'frames': self.frames,
+                    'dropped': self.dropped,
+                    'stalls': self.stalls,
+                }
+
+            due += delay
+            canvas = present(matrix, canvas, max(0.0, due - time.monotonic()))
+            if time.monotonic() - due > 1.0:
+                # After a long stall, start pacing from now instead of racing to catch up.
+                due = time.monotonic()
+
+    def close(self):
+        self.worker.terminate()
+        self.worker.join(1.0)
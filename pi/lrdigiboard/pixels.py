@@ -0,0 +1,194 @@
+"""Pixel art mode with the live-draw FIFO."""
+
+import base64
+import os
+import select
+import time
+
+from . import runtime
+from .drawing import hex_to_rgb
+from .runtime import HeadlessMatrix, clamp, draw_framebuffer, matrix_geometry, present
+
+
+LIVE_FIFO = '/tmp/lrdigiboard-live.fifo'
+
+
+def open_live_channel(path):
+    """Open a freshly created live-draw FIFO for non-blocking reads.
+
+    Any file already at path is replaced, so the renderer never reads from a FIFO another
+    user planted in /tmp. Only the renderer's own user may write to it; the server's writer
+    runs as that same user (through sudo when the renderer does).
+    """
+    try:
+        if os.path.lexists(path):
+            os.remove(path)
+        os.mkfifo(path, 0o600)
+        os.chmod(path, 0o600)
+        read_fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return None
+
+    try:
+        # Holding a write end open means writers disconnecting never leave us at EOF.
+        keepalive_fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        os.close(read_fd)
+        return None
+
+    return {'read_fd': read_fd, 'keepalive_fd': keepalive_fd, 'pending': b''}
+
+
+def close_live_channel(channel):
+    if channel is None:
+        return
+    for key in ('read_fd', 'keepalive_fd'):
+        try:
+            os.close(channel[key])
+        except OSError:
+            pass
+
+
+def apply_live_commands(framebuffer, line, tiles=None):
+    """Apply 'index:rrggbb' cell updates and '*:rrggbb' fills to a packed RGB buffer."""
+    cell_count = len(framebuffer) // 3
+    for token in line.split():
+        target, _, color = token.partition(':')
+        if len(color) != 6:
+            continue
+        try:
+            rgb = bytes.fromhex(color)
+        except ValueError:
+            continue
+
+        if target == '*':
+            framebuffer[:] = rgb * cell_count
+            if tiles is not None:
+                tiles.mark_all()
+            continue
+
+        try:
+            index = int(target)
+        except ValueError:
+            continue
+        if 0 <= index < cell_count:
+            framebuffer[index * 3:index * 3 + 3] = rgb
+            if tiles is not None:
+                tiles.mark_cell(index)
+
+
+def read_live_commands(channel, framebuffer, timeout, tiles=None):
+    """Wait up to timeout for live-draw input; returns True when the framebuffer changed."""
+    ready, _, _ = select.select([channel['read_fd']], [], [], timeout)
+    if not ready:
+        return False
+
+    try:
+        chunk = os.read(channel['read_fd'], 65536)
+    except BlockingIOError:
+        return False
+
+    lines = (channel['pending'] + chunk).split(b'\n')
+    channel['pending'] = lines.pop()
+    for line in lines:
+        apply_live_commands(framebuffer, line.decode('ascii', 'ignore'), tiles)
+    return bool(lines)
+
+
+class TileTracker:
+    """Per-panel dirty tracking for a static framebuffer on a double-buffered matrix.
+
+    Each swap buffer keeps its own set of tiles that changed since it was last
+    drawn, so an idle image costs nothing and a stroke only redraws its panel.
+    """
+
+    def __init__(self, width, height, tile_width, tile_height, buffers=2):
+        self.width = width
+        self.tile_width = max(1, tile_width)
+        self.tile_height = max(1, tile_height)
+        self.columns = -(-width // self.tile_width)
+        self.tiles = [
+            (x, y, min(width, x + self.tile_width), min(height, y + self.tile_height))
+            for y in range(0, height, self.tile_height)
+            for x in range(0, width, self.tile_width)
+        ]
+        self.pending = [set(range(len(self.tiles))) for _ in range(buffers)]
+        self.slot = 0
+
+    def mark_cell(self, index):
+        x = index % self.width
+        y = index // self.width
+        tile = (y // self.tile_height) * self.columns + x // self.tile_width
+        for pending in self.pending:
+            pending.add(tile)
+
+    def mark_all(self):
+        for pending in self.pending:
+            pending.update(range(len(self.tiles)))
+
+    def draw(self, canvas, framebuffer):
+        pending = self.pending[self.slot]
+        for tile in pending:
+            draw_framebuffer(canvas, framebuffer, self.width, self.tiles[tile])
+        pending.clear()
+        self.slot = (self.slot + 1) % len(self.pending)
+
+
+def decode_pixels(data, cell_count):
+    """Return a packed RGB framebuffer from base64 RGB data or a legacy '#rrggbb' list."""
+    size = cell_count * 3
+    if isinstance(data, str):
+        try:
+            framebuffer = bytearray(base64.b64decode(data)[:size])
+        except ValueError:
+            framebuffer = bytearray()
+        framebuffer.extend(bytes(size - len(framebuffer)))
+        return framebuffer
+
+    framebuffer = bytearray(size)
+    if isinstance(data, list):
+        for index, value in enumerate(data[:cell_count]):
+            framebuffer[index * 3:index * 3 + 3] = bytes(hex_to_rgb(value))
+    return framebuffer
+
+
+def run_pixels(matrix, payload):
+    pixels = payload.get('pixels', {})
+    width = int(clamp(pixels.get('width'), 1, 512, matrix.width))
+    height = int(clamp(pixels.get('height'), 1, 192, matrix.height))
+    framebuffer = decode_pixels(pixels.get('data'), width * height)
+    rows, cols, _, _ = matrix_geometry(payload)
+    tiles = TileTracker(width, height, cols, rows)
+
+    live = None if isinstance(matrix, HeadlessMatrix) else open_live_channel(LIVE_FIFO)
+    canvas = matrix.CreateFrameCanvas()
+
+    generation = runtime.power_generation()
+
+    try:
+        while runtime.RUNNING:
+            if runtime.power_generation() != generation:
+                # Brightness is applied when pixels are set, so a new level means a full redraw.
+                generation = runtime.power_generation()
+                tiles.mark_all()
+            tiles.draw(canvas, framebuffer)
+
+            if live is None:
+                canvas = present(matrix, canvas, 0.2)
+                continue
+
+            canvas = present(matrix, canvas, 0)
+            # Block on the FIFO instead of sleeping so strokes show up as soon as they land.
+            while runtime.RUNNING and not read_live_commands(live, framebuffer, 0.2, tiles):
+                if runtime.STATS is not None and time.monotonic() >= runtime.STATS.next_flush:
+                    # No frames arrive while idle, so flush on schedule or the dashboard goes stale.
+                    runtime.STATS.flush(time.monotonic())
+                if runtime.POWER is not None:
+                    runtime.POWER.regulate(matrix)
+                    if runtime.power_generation() != generation:
+                        break
+            if runtime.STATS is not None:
+                # Waiting for strokes is idle time; render time starts once there is something to draw.
+                runtime.STATS.frame_start = time.monotonic()
+    finally:
+        close_live_channel(live)
@@ -0,0 +1,119 @@
+"""Time-of-day power profile: brightness ramps and blanking windows."""
+
+import time
+
+from . import runtime
+from .runtime import clamp
+
+MINUTES_PER_DAY = 24 * 60
+# Ramps move in whole percent steps, so checking once a second is plenty.
+CHECK_INTERVAL = 1.0
+
+
+def in_window(minute, start, end):
+    if start <= end:
+        return start <= minute < end
+    return minute >= start or minute < end
+
+
+class PowerProfile:
+    """Brightness levels with linear ramps between them, plus blank windows.
+
+    Each level takes over at its minute of the day and is reached ramp minutes
+    later, starting from the level before it. Inside a blank window the panel
+    shows a black canvas and the process sleeps until the window ends.
+    """
+
+    def __init__(self, levels, ramp_minutes, blank):
+        self.levels = sorted(levels)
+        self.ramp = ramp_minutes
+        self.blank = blank
+        self.brightness = None
+        # Bumped on every brightness change; modes that cache drawn pixels redraw on a new value.
+        self.generation = 0
+        self.next_check = 0.0
+        self.blank_canvas = None
+
+    @classmethod
+    def from_payload(cls, data):
+        levels = []
+        for level in data.get('levels') or []:
+            minute = int(clamp(level.get('minute'), 0, MINUTES_PER_DAY - 1, 0))
+            levels.append((minute, int(clamp(level.get('brightness'), 10, 100, 70))))
+
+        blank = []
+        for window in data.get('blank') or []:
+            start = int(clamp(window.get('start'), 0, MINUTES_PER_DAY - 1, 0))
+            end = int(clamp(window.get('end'), 0, MINUTES_PER_DAY - 1, 0))
+            if start != end:
+                blank.append((start, end))
+
+        return cls(levels, clamp(data.get('rampMinutes'), 0, 120, 30), blank)
+
+    def brightness_at(self, minute):
+        if not self.levels:
+            return None
+
+        # Before the first level of the day, yesterday's last level still holds.
+        index = len(self.levels) - 1
+        for position, (start, _level) in enumerate(self.levels):
+            if start <= minute:
+                index = position
+
+        start, level = self.levels[index]
+        previous = self.levels[index - 1][1]
+        elapsed = (minute - start) % MINUTES_PER_DAY
+        if self.ramp and elapsed < self.ramp:
+            return round(previous + (level - previous) * elapsed / self.ramp)
+        return level
+
+    def blank_seconds(self, minute):
+        """Seconds left in the blank window covering minute, or 0 when the panel should be on."""
+        for start, end in self.blank:
+            if in_window(minute, start, end):
+                return ((end - minute) % MINUTES_PER_DAY) * 60.0
+        return 0.0
+
+    def apply_brightness(self, matrix, minute):
+        level = self.brightness_at(minute)
+        if level is not None and level != self.brightness:
+            matrix.brightness = level
+            self.brightness = level
+            self.generation += 1
+
+    def sleep_blank(self, matrix, seconds):
+        """Show black until the window ends, then put the frame that was showing back."""
+        if self.blank_canvas is None:
+            self.blank_canvas = matrix.CreateFrameCanvas()
+            self.blank_canvas.Fill(0, 0, 0)
+
+        if runtime.STATS is not None:
+            runtime.STATS.power = {'brightness': self.brightness, 'blankSeconds': round(seconds)}
+            runtime.STATS.flush(time.monotonic())
+
+        shown = matrix.SwapOnVSync(self.blank_canvas)
+        runtime.idle_wait(seconds)
+        self.blank_canvas = matrix.SwapOnVSync(shown)
+
+        if runtime.STATS is not None:
+            runtime.STATS.frame_start = time.monotonic()
+
+    def regulate(self, matrix):
+        now = time.monotonic()
+        if now < self.next_check:
+            return
+        self.next_check = now + CHECK_INTERVAL
+
+        local = time.localtime()
+        minute = local.tm_hour * 60 + local.tm_min + local.tm_sec / 60.0
+        seconds = self.blank_seconds(minute)
+        if seconds > 0:
+            self.sleep_blank(matrix, seconds)
+            if not runtime.RUNNING:
+                return
+            local = time.localtime()
+            minute = local.tm_hour * 60 + local.tm_min + local.tm_sec / 60.0
+
+        self.apply_brightness(matrix, minute)
+        if runtime.STATS is not None:
+            runtime.STATS.power = {'brightness': self.brightness, 'blankSeconds': 0}
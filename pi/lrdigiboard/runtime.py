@@ -0,0 +1,435 @@
+"""Shared renderer state, frame pacing, stats and the scene runners."""
+
+import json
+import os
+import select
+import signal
+import time
+
+
+RUNNING = True
+STATS = None
+# perf_counter() when the launcher started; startup is measured from here to the first swap.
+STARTED = time.perf_counter()
+STATS_FILE = '/tmp/lrdigiboard-stats.json'
+RENDER_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100)
+PIPELINE_RING = 0
+# Upper bound on pixels held in replay canvases (frames x width x height). The
+# matrix library keeps each canvas as PWM bit-planes, roughly 20 bytes a pixel.
+REPLAY_MAX_PIXELS = 2 * 1024 * 1024
+# PowerProfile from the payload's power settings, when it has any (see power.py).
+POWER = None
+# Read end of the signal wakeup pipe; lets idle_wait() return as soon as SIGTERM lands.
+WAKE_FD = None
+
+
+def on_signal(_signum, _frame):
+    global RUNNING
+    RUNNING = False
+
+
+def install_wakeup():
+    """Route signals through a pipe so long sleeps end early.
+
+    time.sleep() resumes after a signal handler runs, so a clock sleeping to the
+    next minute would keep the panel for up to a minute after pkill.
+    """
+    global WAKE_FD
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+    signal.set_wakeup_fd(write_fd, warn_on_full_buffer=False)
+    WAKE_FD = read_fd
+
+
+def idle_wait(seconds):
+    if seconds <= 0:
+        return
+    if WAKE_FD is None:
+        time.sleep(seconds)
+        return
+    select.select([WAKE_FD], [], [], seconds)
+
+
+def power_generation():
+    return POWER.generation if POWER is not None else 0
+
+
+class RenderStats:
+    """Per-mode frame timing counters, flushed to a JSON file for the dashboard."""
+
+    def __init__(self, mode, path, interval=2.0):
+        self.mode = mode
+        self.path = path
+        self.interval = interval
+        self.started_at = time.time()
+        self.frames = 0
+        self.histogram = [0] * (len(RENDER_BUCKETS_MS) + 1)
+        self.render_total = 0.0
+        self.render_max = 0.0
+        self.swap_total = 0.0
+        self.swap_max = 0.0
+        self.overshoot_total = 0.0
+        self.overshoot_max = 0.0
+        self.fps = 0.0
+        self.cpu_percent = 0.0
+        self.pipeline = None
+        self.replay = None
+        self.power = None
+        self.startup_ms = None
+
+        now = time.monotonic()
+        self.frame_start = now
+        self.window_start = now
+        self.window_frames = 0
+        self.window_cpu = time.process_time()
+        self.next_flush = now + interval
+        self.history = self.load_history()
+
+    def load_history(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                previous = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+        modes = previous.get('modes') if isinstance(previous, dict) else None
+        if not isinstance(modes, dict):
+            return {}
+        return {name: entry for name, entry in modes.items() if name != self.mode}
+
+    def record(self, render_seconds, swap_seconds, overshoot_seconds, frame_end):
+        render_ms = render_seconds * 1000.0
+        swap_ms = swap_seconds * 1000.0
+        overshoot_ms = max(0.0, overshoot_seconds * 1000.0)
+
+        bucket = len(RENDER_BUCKETS_MS)
+        for index, upper in enumerate(RENDER_BUCKETS_MS):
+            if render_ms <= upper:
+                bucket = index
+                break
+        self.histogram[bucket] += 1
+
+        self.frames += 1
+        self.window_frames += 1
+        self.render_total += render_ms
+        self.render_max = max(self.render_max, render_ms)
+        self.swap_total += swap_ms
+        self.swap_max = max(self.swap_max, swap_ms)
+        self.overshoot_total += overshoot_ms
+        self.overshoot_max = max(self.overshoot_max, overshoot_ms)
+        self.frame_start = frame_end
+
+        if frame_end >= self.next_flush:
+            self.flush(frame_end)
+
+    def flush(self, now):
+        elapsed = max(1e-6, now - self.window_start)
+        cpu_now = time.process_time()
+        self.fps = self.window_frames / elapsed
+        self.cpu_percent = 100.0 * (cpu_now - self.window_cpu) / elapsed
+        self.window_start = now
+        self.window_frames = 0
+        self.window_cpu = cpu_now
+        self.next_flush = now + self.interval
+
+        if not self.path:
+            return
+
+        snapshot = {
+            'version': 1,
+            'pid': os.getpid(),
+            'mode': self.mode,
+            'updatedAt': time.time(),
+            'modes': {**self.history, self.mode: self.snapshot()},
+        }
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as handle:
+                json.dump(snapshot, handle, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except OSError:
+            # Telemetry must never take the renderer down (e.g. /tmp owned by root).
+            pass
+
+    def snapshot(self):
+        frames = max(1, self.frames)
+        labels = [str(upper) for upper in RENDER_BUCKETS_MS] + ['+Inf']
+        return {
+            'startedAt': self.started_at,
+            'updatedAt': time.time(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'frames': self.frames,
+            'fps': round(self.fps, 2),
+            'renderMs': {
+                'avg': round(self.render_total / frames, 3),
+                'max': round(self.render_max, 3),
+                'histogram': dict(zip(labels, self.histogram)),
+            },
+            'swapMs': {
+                'avg': round(self.swap_total / frames, 3),
+                'max': round(self.swap_max, 3),
+            },
+            'sleepOvershootMs': {
+                'avg': round(self.overshoot_total / frames, 3),
+                'max': round(self.overshoot_max, 3),
+            },
+            'cpuPercent': round(self.cpu_percent, 1),
+            'rssKb': read_rss_kb(),
+            'startupMs': self.startup_ms,
+            'pipeline': self.pipeline,
+            'replay': self.replay,
+            'power': self.power,
+        }
+
+
+def startup_ms():
+    return round((time.perf_counter() - STARTED) * 1000.0, 1)
+
+
+def read_rss_kb():
+    try:
+        with open('/proc/self/statm', 'r', encoding='utf-8') as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def present(matrix, canvas, delay):
+    """Swap the finished frame in, then sleep; records timings when stats are on."""
+    if isinstance(matrix, HeadlessMatrix):
+        canvas = matrix.SwapOnVSync(canvas)
+        matrix.record_delay(delay)
+        return canvas
+
+    if STATS is None:
+        canvas = matrix.SwapOnVSync(canvas)
+        idle_wait(delay)
+    else:
+        swap_start = time.monotonic()
+        canvas = matrix.SwapOnVSync(canvas)
+        if STATS.startup_ms is None:
+            # Taken at the first swap, before this frame's sleep (up to a minute in clock mode).
+            STATS.startup_ms = startup_ms()
+        sleep_start = time.monotonic()
+        idle_wait(delay)
+        frame_end = time.monotonic()
+
+        STATS.record(
+            swap_start - STATS.frame_start,
+            sleep_start - swap_start,
+            (frame_end - sleep_start) - delay,
+            frame_end,
+        )
+
+    if POWER is not None:
+        POWER.regulate(matrix)
+    return canvas
+
+
+def clamp(value, low, high, fallback):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return fallback
+
+    return max(low, min(high, number))
+
+
+class HeadlessCanvas:
+    """In-memory stand-in for an rgbmatrix FrameCanvas (packed RGB bytes).
+
+    pixels may be any writable byte buffer, e.g. a slot of the pipeline ring.
+    """
+
+    def __init__(self, width, height, pixels=None):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(width * height * 3) if pixels is None else pixels
+
+    def Fill(self, r, g, b):
+        self.pixels[:] = bytes((r, g, b)) * (self.width * self.height)
+
+    def SetPixel(self, x, y, r, g, b):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            index = (y * self.width + x) * 3
+            self.pixels[index] = max(0, min(255, int(r)))
+            self.pixels[index + 1] = max(0, min(255, int(g)))
+            self.pixels[index + 2] = max(0, min(255, int(b)))
+
+
+class HeadlessMatrix:
+    """Captures swapped frames instead of driving the panel, for off-device previews."""
+
+    def __init__(self, width, height, frame_limit):
+        self.width = width
+        self.height = height
+        self.brightness = 100
+        self.frame_limit = max(1, int(frame_limit))
+        self.frames = []
+        self.delays = []
+        self.startup_ms = None
+        self.back = HeadlessCanvas(width, height)
+
+    def CreateFrameCanvas(self):
+        return HeadlessCanvas(self.width, self.height)
+
+    def SwapOnVSync(self, canvas):
+        global RUNNING
+        if self.startup_ms is None:
+            self.startup_ms = startup_ms()
+        if len(self.frames) < self.frame_limit:
+            self.frames.append(bytes(canvas.pixels))
+            if len(self.frames) >= self.frame_limit:
+                RUNNING = False
+
+        # Hand back the previous buffer like the real double-buffered matrix does.
+        previous = self.back
+        self.back = canvas
+        return previous
+
+    def record_delay(self, delay):
+        if len(self.delays) < len(self.frames):
+            self.delays.append(round(delay, 4))
+
+
+# Widgets, message, clock and valentine layouts are designed for one 64x32 panel.
+LAYOUT_WIDTH = 64
+LAYOUT_HEIGHT = 32
+
+
+def layout_scale(width, height):
+    """Largest integer scale at which the 64x32 layouts still fit the panel wall."""
+    return max(1, min(width // LAYOUT_WIDTH, height // LAYOUT_HEIGHT))
+
+
+class ScaledCanvas:
+    """Canvas view in logical pixels, each drawn as a scale x scale block."""
+
+    def __init__(self, canvas, scale):
+        self.canvas = canvas
+        self.scale = scale
+        self.width = canvas.width // scale
+        self.height = canvas.height // scale
+
+    def Fill(self, r, g, b):
+        self.canvas.Fill(r, g, b)
+
+    def SetPixel(self, x, y, r, g, b):
+        set_pixel = self.canvas.SetPixel
+        left = x * self.scale
+        top = y * self.scale
+        for py in range(top, top + self.scale):
+            for px in range(left, left + self.scale):
+                set_pixel(px, py, r, g, b)
+
+
+def layout_view(canvas, scale):
+    return canvas if scale == 1 else ScaledCanvas(canvas, scale)
+
+
+def matrix_geometry(payload):
+    options_data = payload.get('matrixOptions', {})
+    rows = int(clamp(options_data.get('rows'), 16, 64, 32))
+    cols = int(clamp(options_data.get('cols'), 32, 128, 64))
+    chain_length = int(clamp(options_data.get('chainLength'), 1, 4, 1))
+    parallel = int(clamp(options_data.get('parallel'), 1, 3, 1))
+    return rows, cols, chain_length, parallel
+
+
+def build_headless_matrix(payload, frame_limit):
+    rows, cols, chain_length, parallel = matrix_geometry(payload)
+    return HeadlessMatrix(cols * chain_length, rows * parallel, frame_limit)
+
+
+def build_matrix(payload):
+    from rgbmatrix import RGBMatrix, RGBMatrixOptions  # type: ignore
+
+    options_data = payload.get('matrixOptions', {})
+
+    options = RGBMatrixOptions()
+    options.rows = int(clamp(options_data.get('rows'), 16, 64, 32))
+    options.cols = int(clamp(options_data.get('cols'), 32, 128, 64))
+    options.chain_length = int(clamp(options_data.get('chainLength'), 1, 4, 1))
+    options.parallel = int(clamp(options_data.get('parallel'), 1, 3, 1))
+    options.hardware_mapping = str(options_data.get('hardwareMapping') or 'regular')
+    rgb_sequence = str(options_data.get('rgbSequence') or '').upper()
+    if rgb_sequence in ('RGB', 'RBG', 'GRB', 'GBR', 'BRG', 'BGR'):
+        options.led_rgb_sequence = rgb_sequence
+    options.gpio_slowdown = int(clamp(options_data.get('gpioSlowdown'), 0, 8, 4))
+    options.disable_hardware_pulsing = bool(options_data.get('noHardwarePulse', True))
+    options.pwm_bits = int(clamp(options_data.get('pwmBits'), 1, 11, 11))
+    options.pwm_lsb_nanoseconds = int(clamp(options_data.get('pwmLsbNanoseconds'), 50, 300, 130))
+
+    matrix = RGBMatrix(options=options)
+    brightness = int(clamp(payload.get('brightness'), 10, 100, 70))
+    matrix.brightness = brightness
+    return matrix
+
+
+# Frames per loop for the sine-driven effects. The phase step is derived from it
+# so the loop closes exactly and can be replayed from cache.
+PULSE_LOOP_FRAMES = 21
+
+
+def run_replay(matrix, scene, period):
+    """Render the first loop into canvases of its own, then only swap those canvases.
+
+    The first pass is shown live as it renders, so there is no warm-up pause;
+    after that each frame costs a SwapOnVSync and a sleep. Brightness is applied
+    when pixels are set, so a power profile step re-renders the loop in place.
+    """
+    frames = []
+    delays = []
+    stamps = []
+    rendered = 0
+    index = 0
+    while RUNNING:
+        generation = power_generation()
+        if index < len(frames) and stamps[index] != generation:
+            # Scenes only render forwards, so resume where the scene's own loop is.
+            index = rendered % period
+        if index == len(frames):
+            frames.append(matrix.CreateFrameCanvas())
+            delays.append(0.0)
+            stamps.append(None)
+        if stamps[index] != generation:
+            delays[index] = scene.render(frames[index])
+            stamps[index] = generation
+            rendered += 1
+            if STATS is not None:
+                STATS.replay = {'key': scene.loop_key, 'frames': period, 'cached': stamps.count(generation)}
+        present(matrix, frames[index], delays[index])
+        index = (index + 1) % period
+
+
+def run_scene(matrix, scene):
+    """Replay periodic scenes from cache; otherwise drive them inline or through a FramePipeline."""
+    period = getattr(scene, 'period', None)
+    if REPLAY_MAX_PIXELS and period and period * matrix.width * matrix.height <= REPLAY_MAX_PIXELS:
+        run_replay(matrix, scene, period)
+        return
+
+    if PIPELINE_RING and not isinstance(matrix, HeadlessMatrix):
+        from .pipeline import FramePipeline
+
+        pipeline = FramePipeline(scene, matrix.width, matrix.height, PIPELINE_RING)
+        try:
+            pipeline.run(matrix)
+        finally:
+            pipeline.close()
+        return
+
+    canvas = matrix.CreateFrameCanvas()
+    while RUNNING:
+        canvas = present(matrix, canvas, scene.render(canvas))
+
+
+def draw_framebuffer(canvas, framebuffer, width, region):
+    left, top, right, bottom = region
+    set_pixel = canvas.SetPixel
+    for y in range(top, min(bottom, canvas.height)):
+        row = y * width * 3
+        for x in range(left, min(right, canvas.width)):
+            index = row + x * 3
+            set_pixel(x, y, framebuffer[index], framebuffer[index + 1], framebuffer[index + 2])
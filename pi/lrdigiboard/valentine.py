@@ -0,0 +1,164 @@
+"""Valentine mode: question, flower bed and optional fireworks."""
+
+import random
+from array import array
+
+from .drawing import clear, draw_pixel, draw_text, text_width, wrap_text
+from .particles import BURST_DIRECTIONS, ParticlePool
+from .runtime import layout_scale, layout_view, run_scene
+
+
+def draw_flower(canvas, x, y):
+    petals = [
+        (x, y - 2),
+        (x - 2, y),
+        (x + 2, y),
+        (x, y + 2),
+        (x, y),
+    ]
+    for px, py in petals:
+        draw_pixel(canvas, px, py, (255, 105, 180))
+    draw_pixel(canvas, x, y, (255, 225, 245))
+
+    for step in range(1, 5):
+        draw_pixel(canvas, x, y + 2 + step, (70, 190, 90))
+
+    draw_pixel(canvas, x - 1, y + 4, (95, 220, 120))
+    draw_pixel(canvas, x + 1, y + 5, (95, 220, 120))
+
+
+FIREWORK_COLORS = (
+    (255, 145, 210),
+    (255, 215, 120),
+    (120, 220, 255),
+    (255, 170, 185),
+)
+
+
+class FireworkShow:
+    """Rockets in parallel per-lane arrays feeding a shared spark pool."""
+
+    SPARK_SPEED = 0.44
+    SPARK_OFFSET = 0.35
+
+    def __init__(self, width, height, lanes=3):
+        self.width = width
+        self.height = height
+        self.lanes = max(1, int(lanes))
+        self.x = array('f', [0.0]) * self.lanes
+        self.y = array('f', [0.0]) * self.lanes
+        self.vx = array('f', [0.0]) * self.lanes
+        self.vy = array('f', [0.0]) * self.lanes
+        self.target_y = array('f', [0.0]) * self.lanes
+        self.wait = array('H', [0]) * self.lanes
+        self.sparks = ParticlePool(self.lanes * (len(BURST_DIRECTIONS) + 1))
+
+        for lane in range(self.lanes):
+            self.launch(lane)
+
+    def launch(self, lane):
+        low = max(8, (self.width * lane) // self.lanes)
+        high = max(low, min(self.width - 8, (self.width * (lane + 1)) // self.lanes))
+
+        self.x[lane] = float(random.randint(low, high))
+        self.y[lane] = float(self.height - 1)
+        self.vx[lane] = random.choice([-0.16, -0.08, 0.0, 0.08, 0.16])
+        self.vy[lane] = random.uniform(0.92, 1.26)
+        self.target_y[lane] = random.randint(4, 11)
+        self.wait[lane] = 0
+
+    def explode(self, lane):
+        max_radius = random.uniform(3.2, 5.6)
+        life = int((max_radius - self.SPARK_OFFSET) / self.SPARK_SPEED) + 1
+        color = random.choice(FIREWORK_COLORS)
+        directions = random.sample(BURST_DIRECTIONS, random.choice([8, 10, 12]))
+        x = self.x[lane]
+        y = self.y[lane]
+
+        self.sparks.emit(x, y, 0.0, 0.0, life, (255, 240, 250))
+        self.sparks.burst(x, y, self.SPARK_SPEED, life, color, directions, self.SPARK_OFFSET)
+        self.wait[lane] = life
+
+    def draw(self, canvas):
+        for lane in range(self.lanes):
+            if self.wait[lane]:
+                continue
+            x = int(round(self.x[lane]))
+            y = int(round(self.y[lane]))
+            draw_pixel(canvas, x, y, (255, 255, 255))
+            draw_pixel(canvas, x, y + 1, (255, 180, 200))
+            draw_pixel(canvas, x, y + 2, (230, 120, 140))
+
+        # Tail one pixel behind the head once the burst radius passes ~2.6px.
+        self.sparks.draw(
+            canvas,
+            min_fade=0.18,
+            trail_after=6,
+            trail_steps=1.0 / self.SPARK_SPEED,
+        )
+
+    def advance(self):
+        for lane in range(self.lanes):
+            if self.wait[lane]:
+                self.wait[lane] -= 1
+                if not self.wait[lane]:
+                    self.launch(lane)
+                continue
+
+            self.x[lane] = max(2.0, min(self.width - 3.0, self.x[lane] + self.vx[lane]))
+            self.y[lane] -= self.vy[lane]
+            self.vy[lane] = max(0.58, self.vy[lane] * 0.988)
+
+            if self.y[lane] <= self.target_y[lane]:
+                self.explode(lane)
+
+        self.sparks.update()
+
+
+class ValentineScene:
+    """Question, flower bed and optional fireworks; render() draws one frame and returns its delay."""
+
+    def __init__(self, width, height, payload):
+        config = payload.get('valentine', {})
+        question = str(config.get('question') or 'Will you be my Valentine?')
+        self.fireworks = FireworkShow(width, height, max(3, width // 20)) if config.get('fireworks') else None
+        # Without fireworks the frame never changes, so two cached canvases cover it.
+        self.period = None if self.fireworks else 2
+        self.loop_key = f'valentine:{question}:{width}x{height}'
+
+        self.scale = layout_scale(width, height)
+        self.width = width // self.scale
+        layout_height = height // self.scale
+
+        self.question_lines = wrap_text(question, self.width // 4 - 1, max(1, (layout_height - 14) // 6))
+        if not self.question_lines:
+            self.question_lines = ['Will you be my', 'Valentine?']
+
+        # Flower bed near the bottom, mirrored into both corners.
+        left_flowers = [
+            (5, layout_height - 9), (10, layout_height - 7), (15, layout_height - 9),
+            (20, layout_height - 7), (25, layout_height - 9),
+        ]
+        self.flower_positions = left_flowers + [(self.width - fx, fy) for fx, fy in reversed(left_flowers)]
+
+    def render(self, canvas):
+        clear(canvas)
+        view = layout_view(canvas, self.scale)
+
+        base_y = 4
+        for index, line in enumerate(self.question_lines):
+            line_x = max(0, (self.width - text_width(line)) // 2)
+            draw_text(view, line_x, base_y + index * 6, line, (255, 40, 40))
+
+        for fx, fy in self.flower_positions:
+            draw_flower(view, fx, fy)
+
+        if self.fireworks is not None:
+            self.fireworks.draw(canvas)
+            self.fireworks.advance()
+
+        return 0.09
+
+
+def run_valentine(matrix, payload):
+    run_scene(matrix, ValentineScene(matrix.width, matrix.height, payload))
@@ -0,0 +1,310 @@
+"""Widgets mode: clock, weather, todo list and next calendar event."""
+
+import re
+from datetime import datetime
+
+from . import runtime
+from .drawing import (
+    clear,
+    draw_hline,
+    draw_pixel,
+    draw_text,
+    draw_text_compact,
+    draw_text_todo,
+    draw_vline,
+    drawn_text_width,
+    text_width,
+    wrap_text,
+)
+from .runtime import layout_scale, layout_view, present
+
+
+def draw_box(canvas, x1, y1, x2, y2, color):
+    draw_hline(canvas, x1, x2, y1, color)
+    draw_hline(canvas, x1, x2, y2, color)
+    draw_vline(canvas, x1, y1, y2, color)
+    draw_vline(canvas, x2, y1, y2, color)
+
+
+def draw_box_text(canvas, x, y, width, height, title, lines, title_color, text_color):
+    max_chars = max(1, (width - 3) // 4)
+    max_lines = max(1, (height - 7) // 6)
+
+    draw_text(canvas, x + 1, y + 1, title[:max_chars], title_color)
+
+    line_y = y + 7
+    printed = 0
+
+    for raw in lines:
+        wrapped = wrap_text(raw, max_chars, max_lines - printed)
+        for line in wrapped:
+            if printed >= max_lines:
+                return
+            draw_text(canvas, x + 1, line_y, line, text_color)
+            line_y += 6
+            printed += 1
+
+
+def fit_text(value, max_chars):
+    text = str(value or '').strip()
+    if not text:
+        return ''
+    return text[:max_chars]
+
+
+def fit_todo_text(value, max_pixels, space_advance):
+    text = str(value or '').strip()
+    if not text:
+        return ''
+
+    allowed = []
+    width = 0
+    for char in text:
+        advance = space_advance if char == ' ' else 4
+        if width + advance > max_pixels:
+            break
+        allowed.append(char)
+        width += advance
+
+    return ''.join(allowed).rstrip()
+
+
+def draw_weather_icon(canvas, x, y, icon_name):
+    icon = str(icon_name or 'cloud').lower()
+
+    if icon == 'sun':
+        color = (255, 245, 0)
+        pattern = ['00100', '10101', '01110', '10101', '00100']
+    elif icon == 'moon':
+        color = (230, 230, 255)
+        pattern = ['01110', '11000', '11000', '11000', '01110']
+    elif icon == 'rain':
+        color = (60, 170, 255)
+        pattern = ['01110', '11111', '11111', '01010', '10101']
+    elif icon == 'storm':
+        color = (255, 180, 40)
+        pattern = ['01110', '11111', '00100', '01100', '11000']
+    elif icon == 'snow':
+        color = (230, 245, 255)
+        pattern = ['10101', '01110', '10101', '01110', '10101']
+    elif icon == 'fog':
+        color = (185, 210, 220)
+        pattern = ['00000', '11111', '00000', '11111', '00000']
+    elif icon == 'cloud':
+        color = (190, 210, 235)
+        pattern = ['00000', '01110', '11111', '11111', '01110']
+    else:
+        color = (180, 210, 240)
+        pattern = ['00000', '01110', '11111', '01110', '00000']
+
+    for row_index, row in enumerate(pattern):
+        for col_index, bit in enumerate(row):
+            if bit == '1':
+                draw_pixel(canvas, x + col_index, y + row_index, color)
+
+
+def draw_todo_bullet(canvas, x, y, style):
+    bullet_style = str(style or 'dot').lower()
+    color = (255, 120, 120)
+
+    if bullet_style == 'heart':
+        pattern = ['01010', '11111', '11111', '01110', '00100']
+    elif bullet_style == 'star':
+        pattern = ['00100', '10101', '01110', '10101', '00100']
+    elif bullet_style == 'diamond':
+        pattern = ['00100', '01110', '11111', '01110', '00100']
+    else:
+        pattern = ['00000', '00100', '01110', '00100', '00000']
+
+    for row_index, row in enumerate(pattern):
+        for col_index, bit in enumerate(row):
+            if bit == '1':
+                draw_pixel(canvas, x + col_index, y + row_index, color)
+
+
+def format_event_time(value):
+    text = str(value or '').strip()
+    if len(text) >= 5 and text[2] == ':':
+        return text[:5]
+    return '00:00'
+
+
+def split_course_parts(value, program_max_chars=4, number_max_chars=4):
+    text = str(value or '').strip().upper()
+    if not text:
+        return ('', '')
+
+    structured = re.search(r'([A-Z]{2,})\s*([0-9]{2,}[A-Z]?)', text)
+    if structured:
+        return (
+            structured.group(1)[:program_max_chars],
+            structured.group(2)[:number_max_chars],
+        )
+
+    compact = re.sub(r'[^A-Z0-9]', '', text)
+    letters_match = re.match(r'[A-Z]+', compact)
+    numbers_match = re.search(r'[0-9][0-9A-Z]*$', compact)
+    program = (letters_match.group(0) if letters_match else compact)[:program_max_chars]
+    number = (numbers_match.group(0) if numbers_match else '')[:number_max_chars]
+    return (program, number)
+
+
+def next_upcoming_event(events):
+    now = datetime.now()
+    nearest = None
+
+    for event in events:
+        date_text = str(event.get('date') or '').strip()
+        time_text = format_event_time(event.get('time'))
+        title_text = str(event.get('title') or '').strip()
+
+        if not date_text or not title_text:
+            continue
+
+        try:
+            when = datetime.strptime(f'{date_text} {time_text}', '%Y-%m-%d %H:%M')
+        except ValueError:
+            continue
+
+        if when < now:
+            continue
+
+        if nearest is None or when < nearest['when']:
+            nearest = {
+                'when': when,
+                'time': time_text,
+                'title': title_text
+            }
+
+    return nearest
+
+
+def run_widgets(matrix, payload):
+    widgets = payload.get('widgets', {})
+    weather = widgets.get('weather', {})
+    calendar = widgets.get('calendar', {})
+    todo = widgets.get('todo', {})
+
+    border = (40, 96, 118)
+    title_color = (255, 210, 100)
+    text_color = (214, 235, 255)
+    muted_color = (130, 150, 166)
+    scale = layout_scale(matrix.width, matrix.height)
+    width = matrix.width // scale
+    height = matrix.height // scale
+    # The calendar column keeps its 16px width; wider walls give the todo list the room.
+    divider_x = width - 17
+    divider_y = 7
+    top_row_y = 1
+    box_top_y = divider_y + 1
+    box_content_y = box_top_y + 2  # 2px below box top.
+    line_gap = 6
+    date_gap = 2  # Pixel gap between time and date (move date 1px left vs previous).
+    month_day_gap = 1  # Pixel gap between month and day (tighter than a full space).
+    todo_word_gap = 2  # Total pixel gap between words.
+    # draw_text_todo already leaves a 1px gap after each character; subtract it for spaces.
+    todo_space_advance = max(0, todo_word_gap - 1)
+    max_todo_items = max(3, (height - box_content_y + 1) // line_gap)
+
+    canvas = matrix.CreateFrameCanvas()
+
+    while runtime.RUNNING:
+        clear(canvas)
+        view = layout_view(canvas, scale)
+
+        draw_hline(view, 0, width - 1, divider_y, border)
+        draw_vline(view, divider_x, box_top_y, height - 1, border)
+
+        # Top row: live time + date + weather
+        now = datetime.now()
+        time_text = f"{now.hour}:{now.minute:02d}"
+        month_text = now.strftime('%b').upper()
+        day_text = str(now.day)
+        time_x = 1
+        time_width = drawn_text_width(time_text, 4)
+
+        if weather.get('enabled', True):
+            temp_value = str(weather.get('temp', '--')).strip()
+            unit_value = str(weather.get('unit', 'F')).strip()
+            draw_temp_text = fit_text(f"{temp_value}{unit_value}", 4)
+            icon_name = str(weather.get('icon', 'cloud') or 'cloud')
+            if icon_name.lower() == 'sun' and (now.hour < 6 or now.hour >= 18):
+                icon_name = 'moon'
+            temp_text_width = drawn_text_width(draw_temp_text, 4)
+            weather_block_width = temp_text_width + 1 + 5
+            weather_x = width - weather_block_width - 1
+
+            max_clock_width = weather_x - time_x
+            date_options = [
+                {'gap': month_day_gap, 'day_compact': False},
+                {'gap': 1, 'day_compact': False},
+                {'gap': 1, 'day_compact': True},
+            ]
+            selected_option = None
+            month_width = drawn_text_width(month_text, 4)
+            day_width_normal = drawn_text_width(day_text, 4)
+            day_width_compact = drawn_text_width(day_text, 3)
+            for option in date_options:
+                day_width = day_width_compact if option['day_compact'] else day_width_normal
+                total_date_width = month_width
+                if day_width:
+                    total_date_width += option['gap'] + day_width
+                option_width = time_width + date_gap + total_date_width
+                if option_width <= max_clock_width:
+                    selected_option = option
+                    break
+
+            draw_text(view, time_x, top_row_y, time_text, (255, 242, 194))
+            if selected_option:
+                date_x = time_x + time_width + date_gap
+                draw_text(view, date_x, top_row_y, month_text, (255, 242, 194))
+                day_x = date_x + month_width + selected_option['gap']
+                if selected_option['day_compact']:
+                    draw_text_compact(view, day_x, top_row_y, day_text, (255, 242, 194))
+                else:
+                    draw_text(view, day_x, top_row_y, day_text, (255, 242, 194))
+            icon_x = weather_x + temp_text_width + 1
+            draw_text(view, weather_x, top_row_y, draw_temp_text, (155, 236, 255))
+            draw_weather_icon(view, icon_x, top_row_y, icon_name)
+        else:
+            draw_text(view, time_x, top_row_y, time_text, (255, 242, 194))
+            date_x = time_x + time_width + date_gap
+            draw_text(view, date_x, top_row_y, month_text, (255, 242, 194))
+            day_x = date_x + drawn_text_width(month_text, 4) + month_day_gap
+            draw_text(view, day_x, top_row_y, day_text, (255, 242, 194))
+            draw_text(view, width - text_width('OFF') - 1, top_row_y, 'OFF', muted_color)
+
+        # Bottom-left: todo list gets most of the width
+        todo_items = todo.get('items', []) if todo.get('enabled', True) else []
+        todo_style = todo.get('bulletStyle', 'dot')
+        todo_y = max(0, box_content_y - 1)
+        todo_text_x = 6
+        todo_max_pixels = max(0, divider_x - todo_text_x)
+
+        if not todo.get('enabled', True):
+            draw_text(view, 1, todo_y, 'OFF', muted_color)
+        elif not todo_items:
+            draw_text(view, 1, todo_y, 'NONE', muted_color)
+        else:
+            for item in todo_items[:max_todo_items]:
+                draw_todo_bullet(view, 0, todo_y, todo_style)
+                todo_text = fit_todo_text(item.get('text', ''), todo_max_pixels, todo_space_advance)
+                draw_text_todo(view, todo_text_x, todo_y, todo_text, text_color, todo_space_advance)
+                todo_y += line_gap
+
+        # Bottom-right: one upcoming calendar event.
+        panel_x = divider_x + 2
+        calendar_y = max(0, box_content_y - 1)
+        if not calendar.get('enabled', True):
+            draw_text_compact(view, panel_x, calendar_y, 'OFF', muted_color)
+        else:
+            event = next_upcoming_event(calendar.get('events', []))
+            if not event:
+                draw_text_compact(view, panel_x, calendar_y, 'FREE', muted_color)
+            else:
+                draw_text_compact(view, panel_x, calendar_y, event['time'], text_color)
+                program, number = split_course_parts(event['title'], 4, 4)
+                draw_text(view, panel_x, calendar_y + line_gap, program or 'CLAS', text_color)
+                draw_text(view, panel_x, calendar_y + (2 * line_gap), number or '----', text_color)
+
+        canvas = present(matrix, canvas, 0.25)
@@ -1,8 +1,9 @@
 'use strict';
 
+// The on-page previews simulate the renderer's single-panel 64x32 layouts.
 const BOARD_WIDTH = 64;
 const BOARD_HEIGHT = 32;
-const PIXEL_SCALE = 10;
+const PIXEL_EDITOR_WIDTH = 640;
 
 const ids = {
   statusPill: document.getElementById('status-pill'),
@@ -10,6 +11,7 @@ const ids = {
   saveAll: document.getElementById('save-all'),
   stopBoard: document.getElementById('stop-board'),
   pushActive: document.getElementById('push-active'),
+  rendererPreview: document.getElementById('renderer-preview'),
 
   piHost: document.getElementById('pi-host'),
   piPort: document.getElementById('pi-port'),
@@ -39,6 +41,8 @@ const ids = {
   calendarEvents: document.getElementById('calendar-events'),
   addEvent: document.getElementById('add-event'),
   calendarImportStatus: document.getElementById('calendar-import-status'),
+  calendarImportFile: document.getElementById('calendar-import-file'),
+  calendarImport: document.getElementById('calendar-import'),
 
   todoEnabled: document.getElementById('todo-enabled'),
   todoBulletStyle: document.getElementById('todo-bullet-style'),
@@ -60,6 +64,16 @@ const ids = {
   clockDayStart: document.getElementById('clock-day-start'),
   clockBrightness: document.getElementById('clock-brightness'),
   clockBrightnessValue: document.getElementById('clock-brightness-value'),
+  powerEnabled: document.getElementById('power-enabled'),
+  powerDayTime: document.getElementById('power-day-time'),
+  powerNightTime: document.getElementById('power-night-time'),
+  powerDayBrightness: document.getElementById('power-day-brightness'),
+  powerDayBrightnessValue: document.getElementById('power-day-brightness-value'),
+  powerNightBrightness: document.getElementById('power-night-brightness'),
+  powerNightBrightnessValue: document.getElementById('power-night-brightness-value'),
+  powerRamp: document.getElementById('power-ramp'),
+  powerBlankStart: document.getElementById('power-blank-start'),
+  powerBlankEnd: document.getElementById('power-blank-end'),
 
   valentineQuestion: document.getElementById('valentine-question'),
   valentineFireworks: document.getElementById('valentine-fireworks'),
@@ -69,10 +83,16 @@ const ids = {
   pixelErase: document.getElementById('pixel-erase'),
   pixelClear: document.getElementById('pixel-clear'),
   pixelFill: document.getElementById('pixel-fill'),
+  pixelLive: document.getElementById('pixel-live'),
   pixelCanvas: document.getElementById('pixel-canvas'),
+  pixelGrid: document.getElementById('pixel-grid'),
 
   previewCanvas: document.getElementById('preview-canvas'),
 
+  rendererStats: document.getElementById('renderer-stats'),
+  rendererStatsUpdated: document.getElementById('renderer-stats-updated'),
+  refreshStats: document.getElementById('refresh-stats'),
+
   calendarTemplate: document.getElementById('calendar-event-template'),
   todoTemplate: document.getElementById('todo-item-template')
 };
@@ -80,6 +100,24 @@ const ids = {
 const previewCtx = ids.previewCanvas.getContext('2d');
 const pixelCtx = ids.pixelCanvas.getContext('2d');
 
+// Board-resolution backing store: painting updates single cells here and the
+// visible canvases are refreshed once per animation frame from the dirty set.
+// The editor follows the configured panel geometry (cols x chain, rows x parallel).
+let pixelWidth = BOARD_WIDTH;
+let pixelHeight = BOARD_HEIGHT;
+let pixelScale = PIXEL_EDITOR_WIDTH / BOARD_WIDTH;
+const pixelBuffer = document.createElement('canvas');
+pixelBuffer.width = pixelWidth;
+pixelBuffer.height = pixelHeight;
+const pixelBufferCtx = pixelBuffer.getContext('2d');
+let pixelImage = pixelBufferCtx.createImageData(pixelWidth, pixelHeight);
+const dirtyPixelCells = new Set();
+let pixelData = new Uint8Array(pixelWidth * pixelHeight * 3);
+let pixelDataEncoded = '';
+let pixelDataChanged = false;
+let pixelFullRedraw = true;
+let pixelFrameRequested = false;
+
 let appState = null;
 let activeTab = 'widgets';
 let isDrawing = false;
@@ -87,6 +125,15 @@ let eraserActive = false;
 let valentinePreviewPhase = 0;
 let previewTickerStarted = false;
 let weatherAutoTimer = null;
+let rendererStatsTimer = null;
+let rendererPreviewSession = null;
+let liveDrawSession = null;
+// Calendar events live on the server; the editor holds one day and the preview the next week.
+const CALENDAR_SAVE_DELAY_MS = 600;
+let calendarLoadedDay = '';
+let calendarDirty = false;
+let calendarSaveTimer = null;
+let upcomingCalendarEvents = [];
 
 function setStatus(type, text) {
   ids.statusPill.className = 'status-pill';
@@ -145,14 +192,84 @@ function nowClockString() {
   return `${hours}:${minutes} ${shortDateString(now)}`;
 }
 
-function createEmptyPixels() {
-  return Array.from({ length: BOARD_WIDTH * BOARD_HEIGHT }, () => '#000000');
+function hexToRgb(color) {
+  const hex = /^#[0-9a-fA-F]{6}$/.test(color || '') ? color : '#000000';
+  return [parseInt(hex.slice(1, 3), 16), parseInt(hex.slice(3, 5), 16), parseInt(hex.slice(5, 7), 16)];
+}
+
+function decodePixels(data) {
+  const packed = new Uint8Array(pixelWidth * pixelHeight * 3);
+  if (typeof data === 'string') {
+    const binary = atob(data);
+    if (binary.length === packed.length) {
+      for (let index = 0; index < binary.length; index += 1) {
+        packed[index] = binary.charCodeAt(index);
+      }
+    }
+  } else if (Array.isArray(data)) {
+    data.slice(0, pixelWidth * pixelHeight).forEach((color, index) => {
+      packed.set(hexToRgb(color), index * 3);
+    });
+  }
+  return packed;
+}
+
+function encodePixels(packed) {
+  let binary = '';
+  for (let offset = 0; offset < packed.length; offset += 0x8000) {
+    binary += String.fromCharCode.apply(null, packed.subarray(offset, offset + 0x8000));
+  }
+  return btoa(binary);
+}
+
+function configurePixelEditor(width, height) {
+  if (width === pixelWidth && height === pixelHeight) {
+    return;
+  }
+
+  pixelWidth = width;
+  pixelHeight = height;
+  pixelScale = Math.max(2, Math.floor(PIXEL_EDITOR_WIDTH / width));
+  for (const canvas of [ids.pixelCanvas, ids.pixelGrid]) {
+    canvas.width = width * pixelScale;
+    canvas.height = height * pixelScale;
+  }
+  pixelBuffer.width = width;
+  pixelBuffer.height = height;
+  pixelImage = pixelBufferCtx.createImageData(width, height);
+  pixelData = new Uint8Array(width * height * 3);
+  pixelDataEncoded = '';
+  drawPixelGrid();
+  markAllPixelsDirty();
 }
 
+// The editor paints into pixelData; appState only gets the base64 form when it is synced.
 function ensurePixels() {
-  if (!Array.isArray(appState.board.pixels.data) || appState.board.pixels.data.length !== BOARD_WIDTH * BOARD_HEIGHT) {
-    appState.board.pixels.data = createEmptyPixels();
+  if (pixelDataChanged) {
+    return;
   }
+  const pixels = appState.board.pixels;
+  configurePixelEditor(
+    Number(pixels.width) || appState.board.width || BOARD_WIDTH,
+    Number(pixels.height) || appState.board.height || BOARD_HEIGHT
+  );
+  if (pixels.data === pixelDataEncoded) {
+    return;
+  }
+  pixelData = decodePixels(appState.board.pixels.data);
+  pixelDataEncoded = appState.board.pixels.data;
+  markAllPixelsDirty();
+}
+
+function commitPixels() {
+  if (!pixelDataChanged) {
+    return;
+  }
+  pixelDataEncoded = encodePixels(pixelData);
+  appState.board.pixels.data = pixelDataEncoded;
+  appState.board.pixels.width = pixelWidth;
+  appState.board.pixels.height = pixelHeight;
+  pixelDataChanged = false;
 }
 
 function ensureValentineState() {
@@ -190,6 +307,20 @@ function ensureClockScheduleState() {
     : 40;
 }
 
+function ensurePowerProfileState() {
+  const profile = appState.board.powerProfile || {};
+  const levels = Array.isArray(profile.levels) ? profile.levels : [];
+  appState.board.powerProfile = {
+    enabled: Boolean(profile.enabled),
+    rampMinutes: Number.isFinite(Number(profile.rampMinutes)) ? Number(profile.rampMinutes) : 30,
+    levels: [
+      { time: '07:00', brightness: 70, ...levels[0] },
+      { time: '21:00', brightness: 25, ...levels[1] }
+    ],
+    blank: Array.isArray(profile.blank) ? profile.blank.slice(0, 1) : []
+  };
+}
+
 function safeDate(value) {
   const text = String(value || '').trim();
   return /^\d{4}-\d{2}-\d{2}$/.test(text) ? text : '';
@@ -300,100 +431,47 @@ function nextUpcomingEvent(events, now = new Date()) {
   return best;
 }
 
-function normalizeCalendarEventForMerge(event, fallbackSource = 'manual') {
-  const date = safeDate(event?.date);
-  const time = safeTime(event?.time) || '00:00';
-  const title = String(event?.title || '').trim();
-  if (!date || !title) {
-    return null;
-  }
-
-  return {
-    date,
-    time,
-    title,
-    source: String(event?.source || fallbackSource).trim() || fallbackSource
-  };
-}
-
-function calendarSlotKey(event) {
-  return `${event.date}|${event.time || '00:00'}`;
-}
-
-function mergeCalendarEvents(existingEvents, incomingEvents) {
-  const merged = [];
-  const seenSlots = new Set();
-  let added = 0;
-
-  for (const rawEvent of Array.isArray(existingEvents) ? existingEvents : []) {
-    const event = normalizeCalendarEventForMerge(rawEvent, 'manual');
-    if (!event) {
-      continue;
-    }
-    const key = calendarSlotKey(event);
-    if (seenSlots.has(key)) {
-      continue;
-    }
-    seenSlots.add(key);
-    merged.push(event);
-  }
-
-  for (const rawEvent of Array.isArray(incomingEvents) ? incomingEvents : []) {
-    const event = normalizeCalendarEventForMerge(rawEvent, 'csv');
-    if (!event) {
-      continue;
-    }
-    const key = calendarSlotKey(event);
-    if (seenSlots.has(key)) {
-      continue;
-    }
-    seenSlots.add(key);
-    merged.push(event);
-    added += 1;
-  }
-
-  return {
-    events: sortCalendarEvents(merged),
-    added
-  };
+async function refreshUpcomingEvents() {
+  const result = await api(`/api/calendar/events?from=${encodeURIComponent(todayDateString())}`);
+  upcomingCalendarEvents = Array.isArray(result.events) ? result.events : [];
+  return result;
 }
 
-function eventsForCalendarDay(events, date) {
-  const selectedDay = safeDate(date) || todayDateString();
-  return sortCalendarEvents(
-    (Array.isArray(events) ? events : []).filter((event) => safeDate(event?.date) === selectedDay)
-  );
+async function loadCalendarDay(date) {
+  const result = await api(`/api/calendar/day?date=${encodeURIComponent(date)}`);
+  calendarLoadedDay = result.date;
+  calendarDirty = false;
+  renderCalendarEvents(result.events || []);
+  return result;
 }
 
-function mergeCalendarStateWithVisibleDay(allEvents, visibleDayEvents, selectedDay) {
-  const day = safeDate(selectedDay) || todayDateString();
-  const mergedBySlot = new Map();
-
-  for (const rawEvent of Array.isArray(allEvents) ? allEvents : []) {
-    const event = normalizeCalendarEventForMerge(rawEvent, 'manual');
-    if (!event || event.date === day) {
-      continue;
-    }
-    mergedBySlot.set(calendarSlotKey(event), event);
-  }
-
-  for (const rawEvent of Array.isArray(visibleDayEvents) ? visibleDayEvents : []) {
-    const event = normalizeCalendarEventForMerge(rawEvent, 'manual');
-    if (!event) {
-      continue;
-    }
-    mergedBySlot.set(calendarSlotKey(event), event);
+async function flushCalendarDay() {
+  clearTimeout(calendarSaveTimer);
+  if (!calendarDirty || !calendarLoadedDay) {
+    return;
   }
 
-  return sortCalendarEvents(Array.from(mergedBySlot.values()));
+  calendarDirty = false;
+  await api('/api/calendar/day', {
+    method: 'PUT',
+    body: JSON.stringify({
+      date: calendarLoadedDay,
+      events: collectCalendarEvents(calendarLoadedDay)
+    })
+  });
+  await refreshUpcomingEvents();
+  drawPreview();
 }
 
-function renderCalendarEventsForSelectedDay() {
-  const selectedDay = safeDate(ids.calendarDay.value) || todayDateString();
-  const allEvents = Array.isArray(appState?.board?.widgets?.calendar?.events)
-    ? appState.board.widgets.calendar.events
-    : [];
-  renderCalendarEvents(eventsForCalendarDay(allEvents, selectedDay));
+function markCalendarDirty() {
+  calendarDirty = true;
+  clearTimeout(calendarSaveTimer);
+  calendarSaveTimer = setTimeout(() => {
+    flushCalendarDay().catch((error) => {
+      calendarDirty = true;
+      ids.calendarImportStatus.textContent = `Calendar save failed: ${error.message}`;
+    });
+  }, CALENDAR_SAVE_DELAY_MS);
 }
 
 function renderCalendarEvents(events) {
@@ -409,15 +487,11 @@ function renderCalendarEvents(events) {
 
     row.querySelector('[data-role="remove"]').addEventListener('click', () => {
       row.remove();
-      syncStateFromForm();
-      drawPreview();
+      markCalendarDirty();
     });
 
     row.querySelectorAll('input').forEach((input) => {
-      input.addEventListener('input', () => {
-        syncStateFromForm();
-        drawPreview();
-      });
+      input.addEventListener('input', markCalendarDirty);
     });
 
     ids.calendarEvents.appendChild(row);
@@ -470,6 +544,7 @@ function collectTodoItems() {
 function populateFormFromState() {
   ensureValentineState();
   ensureClockScheduleState();
+  ensurePowerProfileState();
 
   ids.piHost.value = appState.pi.host || '';
   ids.piPort.value = String(appState.pi.port || 22);
@@ -493,7 +568,6 @@ function populateFormFromState() {
 
   ids.calendarEnabled.checked = Boolean(widgets.calendar.enabled);
   ids.calendarDay.value = safeDate(widgets.calendar.selectedDate) || todayDateString();
-  renderCalendarEventsForSelectedDay();
 
   ids.todoEnabled.checked = Boolean(widgets.todo.enabled);
   ids.todoBulletStyle.value = widgets.todo.bulletStyle || 'dot';
@@ -516,6 +590,19 @@ function populateFormFromState() {
   ids.clockBrightness.value = String(schedule.brightness ?? 40);
   ids.clockBrightnessValue.textContent = ids.clockBrightness.value;
 
+  const power = appState.board.powerProfile;
+  const [dayLevel, nightLevel] = power.levels;
+  ids.powerEnabled.checked = power.enabled;
+  ids.powerDayTime.value = dayLevel.time;
+  ids.powerDayBrightness.value = String(dayLevel.brightness);
+  ids.powerDayBrightnessValue.textContent = ids.powerDayBrightness.value;
+  ids.powerNightTime.value = nightLevel.time;
+  ids.powerNightBrightness.value = String(nightLevel.brightness);
+  ids.powerNightBrightnessValue.textContent = ids.powerNightBrightness.value;
+  ids.powerRamp.value = String(power.rampMinutes);
+  ids.powerBlankStart.value = power.blank[0]?.start || '';
+  ids.powerBlankEnd.value = power.blank[0]?.end || '';
+
   ids.valentineQuestion.value = appState.board.valentine?.question || 'Will you be my Valentine?';
 
   ensurePixels();
@@ -528,6 +615,7 @@ function syncStateFromForm() {
   }
 
   ensureValentineState();
+  commitPixels();
 
   appState.pi.host = ids.piHost.value.trim();
   appState.pi.port = Number(ids.piPort.value) || 22;
@@ -551,13 +639,7 @@ function syncStateFromForm() {
   appState.board.widgets.weather.unit = ids.weatherUnit.value;
 
   appState.board.widgets.calendar.enabled = ids.calendarEnabled.checked;
-  const selectedCalendarDay = safeDate(ids.calendarDay.value) || todayDateString();
-  appState.board.widgets.calendar.selectedDate = selectedCalendarDay;
-  appState.board.widgets.calendar.events = mergeCalendarStateWithVisibleDay(
-    appState.board.widgets.calendar.events,
-    collectCalendarEvents(selectedCalendarDay),
-    selectedCalendarDay
-  );
+  appState.board.widgets.calendar.selectedDate = safeDate(ids.calendarDay.value) || todayDateString();
 
   appState.board.widgets.todo.enabled = ids.todoEnabled.checked;
   appState.board.widgets.todo.bulletStyle = ids.todoBulletStyle.value;
@@ -578,6 +660,18 @@ function syncStateFromForm() {
     brightness: Number(ids.clockBrightness.value) || 40
   };
 
+  const blankStart = safeTime(ids.powerBlankStart.value);
+  const blankEnd = safeTime(ids.powerBlankEnd.value);
+  appState.board.powerProfile = {
+    enabled: ids.powerEnabled.checked,
+    rampMinutes: Math.min(120, Math.max(0, Math.round(Number(ids.powerRamp.value) || 0))),
+    levels: [
+      { time: safeTime(ids.powerDayTime.value) || '07:00', brightness: Number(ids.powerDayBrightness.value) || 70 },
+      { time: safeTime(ids.powerNightTime.value) || '21:00', brightness: Number(ids.powerNightBrightness.value) || 25 }
+    ],
+    blank: blankStart && blankEnd && blankStart !== blankEnd ? [{ start: blankStart, end: blankEnd }] : []
+  };
+
   appState.board.valentine.question =
     ids.valentineQuestion.value.trim().slice(0, 80) || 'Will you be my Valentine?';
 
@@ -585,6 +679,8 @@ function syncStateFromForm() {
   ids.messageSpeedValue.textContent = String(appState.board.message.speed);
   ids.animationSpeedValue.textContent = String(appState.board.animation.speed);
   ids.clockBrightnessValue.textContent = String(appState.board.clockSchedule.brightness);
+  ids.powerDayBrightnessValue.textContent = ids.powerDayBrightness.value;
+  ids.powerNightBrightnessValue.textContent = ids.powerNightBrightness.value;
 }
 
 function colorFromInput() {
@@ -595,48 +691,214 @@ function cellFromEvent(event) {
   const rect = ids.pixelCanvas.getBoundingClientRect();
   const scaleX = ids.pixelCanvas.width / rect.width;
   const scaleY = ids.pixelCanvas.height / rect.height;
-  const x = Math.floor(((event.clientX - rect.left) * scaleX) / PIXEL_SCALE);
-  const y = Math.floor(((event.clientY - rect.top) * scaleY) / PIXEL_SCALE);
-  if (x < 0 || x >= BOARD_WIDTH || y < 0 || y >= BOARD_HEIGHT) {
+  const x = Math.floor(((event.clientX - rect.left) * scaleX) / pixelScale);
+  const y = Math.floor(((event.clientY - rect.top) * scaleY) / pixelScale);
+  if (x < 0 || x >= pixelWidth || y < 0 || y >= pixelHeight) {
     return null;
   }
   return { x, y };
 }
 
-function paintCell(x, y, color) {
-  ensurePixels();
-  const index = y * BOARD_WIDTH + x;
-  appState.board.pixels.data[index] = color;
-  drawPixelCanvas();
-  drawPreview();
+function flushLiveDraw() {
+  const session = liveDrawSession;
+  if (!session) {
+    return;
+  }
+
+  session.timer = null;
+  if (!session.ready || session.socket.readyState !== WebSocket.OPEN) {
+    return;
+  }
+
+  if (session.fill) {
+    session.socket.send(JSON.stringify({ type: 'fill', color: session.fill }));
+    session.fill = '';
+  }
+
+  if (session.cells.size) {
+    session.socket.send(JSON.stringify({ type: 'cells', cells: Array.from(session.cells) }));
+    session.cells.clear();
+  }
 }
 
-function drawPixelCanvas() {
+function scheduleLiveDrawFlush() {
+  if (liveDrawSession && !liveDrawSession.timer) {
+    liveDrawSession.timer = setTimeout(flushLiveDraw, 16);
+  }
+}
+
+function queueLiveCell(index, color) {
+  if (!liveDrawSession) {
+    return;
+  }
+  liveDrawSession.cells.set(index, color);
+  scheduleLiveDrawFlush();
+}
+
+function queueLiveFill(color) {
+  if (!liveDrawSession) {
+    return;
+  }
+  liveDrawSession.cells.clear();
+  liveDrawSession.fill = color;
+  scheduleLiveDrawFlush();
+}
+
+function stopLiveDraw() {
+  const session = liveDrawSession;
+  if (!session) {
+    return;
+  }
+
+  liveDrawSession = null;
+  clearTimeout(session.timer);
+  session.socket.close();
+}
+
+function startLiveDraw() {
+  stopLiveDraw();
+  syncStateFromForm();
   ensurePixels();
-  pixelCtx.clearRect(0, 0, ids.pixelCanvas.width, ids.pixelCanvas.height);
+  setStatus('working', 'Starting live draw on the LED board...');
 
-  for (let y = 0; y < BOARD_HEIGHT; y += 1) {
-    for (let x = 0; x < BOARD_WIDTH; x += 1) {
-      const index = y * BOARD_WIDTH + x;
-      pixelCtx.fillStyle = appState.board.pixels.data[index] || '#000000';
-      pixelCtx.fillRect(x * PIXEL_SCALE, y * PIXEL_SCALE, PIXEL_SCALE, PIXEL_SCALE);
+  const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+  const socket = new WebSocket(`${protocol}://${window.location.host}/api/board/live`);
+  const session = { socket, cells: new Map(), fill: '', timer: null, ready: false };
+  liveDrawSession = session;
+
+  socket.addEventListener('open', () => {
+    socket.send(JSON.stringify({ type: 'start', state: appState }));
+  });
+
+  socket.addEventListener('message', (event) => {
+    let message;
+    try {
+      message = JSON.parse(event.data);
+    } catch (_error) {
+      return;
+    }
+
+    if (message.type === 'ready') {
+      session.ready = true;
+      setStatus('success', 'Live draw connected. Strokes now appear on the LED board as you paint.');
+      flushLiveDraw();
+    } else if (message.type === 'error') {
+      setStatus('error', message.error || 'Live draw failed.');
+    }
+  });
+
+  socket.addEventListener('close', () => {
+    if (liveDrawSession !== session) {
+      return;
+    }
+    liveDrawSession = null;
+    ids.pixelLive.checked = false;
+    if (session.ready) {
+      setStatus('success', 'Live draw disconnected.');
     }
+  });
+}
+
+function writePixelImage(index) {
+  pixelImage.data[index * 4] = pixelData[index * 3];
+  pixelImage.data[index * 4 + 1] = pixelData[index * 3 + 1];
+  pixelImage.data[index * 4 + 2] = pixelData[index * 3 + 2];
+  pixelImage.data[index * 4 + 3] = 255;
+}
+
+function schedulePixelFrame() {
+  if (pixelFrameRequested) {
+    return;
+  }
+  pixelFrameRequested = true;
+  requestAnimationFrame(renderPixelFrame);
+}
+
+function markAllPixelsDirty() {
+  pixelFullRedraw = true;
+  dirtyPixelCells.clear();
+  schedulePixelFrame();
+}
+
+function renderPixelFrame() {
+  pixelFrameRequested = false;
+  if (pixelFullRedraw) {
+    pixelFullRedraw = false;
+    dirtyPixelCells.clear();
+    for (let index = 0; index < pixelWidth * pixelHeight; index += 1) {
+      writePixelImage(index);
+    }
+    pixelBufferCtx.putImageData(pixelImage, 0, 0);
+    pixelCtx.imageSmoothingEnabled = false;
+    pixelCtx.drawImage(pixelBuffer, 0, 0, pixelWidth * pixelScale, pixelHeight * pixelScale);
+  } else {
+    for (const index of dirtyPixelCells) {
+      const x = index % pixelWidth;
+      const y = (index - x) / pixelWidth;
+      pixelBufferCtx.putImageData(pixelImage, 0, 0, x, y, 1, 1);
+      pixelCtx.fillStyle = `rgb(${pixelData[index * 3]},${pixelData[index * 3 + 1]},${pixelData[index * 3 + 2]})`;
+      pixelCtx.fillRect(x * pixelScale, y * pixelScale, pixelScale, pixelScale);
+    }
+    dirtyPixelCells.clear();
+  }
+
+  if (activeTab === 'pixels') {
+    stopRendererPreview();
+    drawPixelPreview(ids.previewCanvas.width, ids.previewCanvas.height);
   }
+}
 
-  pixelCtx.strokeStyle = 'rgba(255,255,255,0.08)';
-  pixelCtx.lineWidth = 1;
-  for (let x = 0; x <= BOARD_WIDTH; x += 1) {
-    pixelCtx.beginPath();
-    pixelCtx.moveTo(x * PIXEL_SCALE + 0.5, 0);
-    pixelCtx.lineTo(x * PIXEL_SCALE + 0.5, BOARD_HEIGHT * PIXEL_SCALE);
-    pixelCtx.stroke();
+function paintCell(x, y, color) {
+  ensurePixels();
+  const index = y * pixelWidth + x;
+  const [r, g, b] = hexToRgb(color);
+  if (pixelData[index * 3] === r && pixelData[index * 3 + 1] === g && pixelData[index * 3 + 2] === b) {
+    return;
   }
-  for (let y = 0; y <= BOARD_HEIGHT; y += 1) {
-    pixelCtx.beginPath();
-    pixelCtx.moveTo(0, y * PIXEL_SCALE + 0.5);
-    pixelCtx.lineTo(BOARD_WIDTH * PIXEL_SCALE, y * PIXEL_SCALE + 0.5);
-    pixelCtx.stroke();
+  pixelData[index * 3] = r;
+  pixelData[index * 3 + 1] = g;
+  pixelData[index * 3 + 2] = b;
+  pixelDataChanged = true;
+  writePixelImage(index);
+  dirtyPixelCells.add(index);
+  queueLiveCell(index, color);
+  schedulePixelFrame();
+}
+
+function drawPixelCanvas() {
+  markAllPixelsDirty();
+}
+
+function drawPixelGrid() {
+  const gridCtx = ids.pixelGrid.getContext('2d');
+  gridCtx.clearRect(0, 0, ids.pixelGrid.width, ids.pixelGrid.height);
+  if (pixelScale < 4) {
+    // Grid lines would cover most of each cell on large walls.
+    return;
+  }
+  gridCtx.strokeStyle = 'rgba(255,255,255,0.08)';
+  gridCtx.lineWidth = 1;
+  gridCtx.beginPath();
+  for (let x = 0; x <= pixelWidth; x += 1) {
+    gridCtx.moveTo(x * pixelScale + 0.5, 0);
+    gridCtx.lineTo(x * pixelScale + 0.5, pixelHeight * pixelScale);
+  }
+  for (let y = 0; y <= pixelHeight; y += 1) {
+    gridCtx.moveTo(0, y * pixelScale + 0.5);
+    gridCtx.lineTo(pixelWidth * pixelScale, y * pixelScale + 0.5);
   }
+  gridCtx.stroke();
+}
+
+function drawPixelPreview(width, height) {
+  // Letterbox walls whose aspect ratio differs from the preview canvas.
+  const fit = Math.min(width / pixelWidth, height / pixelHeight);
+  const drawWidth = pixelWidth * fit;
+  const drawHeight = pixelHeight * fit;
+  previewCtx.fillStyle = '#000';
+  previewCtx.fillRect(0, 0, width, height);
+  previewCtx.imageSmoothingEnabled = false;
+  previewCtx.drawImage(pixelBuffer, (width - drawWidth) / 2, (height - drawHeight) / 2, drawWidth, drawHeight);
 }
 
 function drawWidgetPreview(width, height) {
@@ -650,7 +912,7 @@ function drawWidgetPreview(width, height) {
       : widgets.weather.icon;
   const weatherIcon = weatherIconSymbol(iconName);
   const weatherText = widgets.weather.enabled ? `${weatherTemp} ${weatherIcon}`.trim() : 'OFF';
-  const nextEvent = widgets.calendar.enabled ? nextUpcomingEvent(widgets.calendar.events || [], now) : null;
+  const nextEvent = widgets.calendar.enabled ? nextUpcomingEvent(upcomingCalendarEvents, now) : null;
   const dividerX = Math.round(width * 0.74);
 
   previewCtx.strokeStyle = 'rgba(255,255,255,0.18)';
@@ -796,11 +1058,76 @@ function drawValentinePreview(width, height, sx, sy) {
   }
 }
 
+function stopRendererPreview() {
+  if (rendererPreviewSession) {
+    clearTimeout(rendererPreviewSession.timer);
+    rendererPreviewSession = null;
+  }
+}
+
+async function decodePreviewFrame(base64Png) {
+  const image = new Image();
+  image.src = `data:image/png;base64,${base64Png}`;
+  await image.decode();
+  return image;
+}
+
+function rendererPreviewFrameCount(tab) {
+  if (tab === 'animation' || tab === 'valentine') {
+    return 48;
+  }
+  if (tab === 'message') {
+    return 96;
+  }
+  return 1;
+}
+
+async function showRendererPreview() {
+  syncStateFromForm();
+  setStatus('working', 'Rendering preview with the board renderer...');
+
+  const result = await api('/api/board/preview', {
+    method: 'POST',
+    body: JSON.stringify({
+      mode: activeTab,
+      state: appState,
+      frames: rendererPreviewFrameCount(activeTab)
+    })
+  });
+
+  const images = await Promise.all(result.frames.map(decodePreviewFrame));
+  stopRendererPreview();
+
+  const session = { timer: null };
+  rendererPreviewSession = session;
+  let index = 0;
+
+  const showFrame = () => {
+    if (rendererPreviewSession !== session) {
+      return;
+    }
+
+    previewCtx.imageSmoothingEnabled = false;
+    previewCtx.drawImage(images[index], 0, 0, ids.previewCanvas.width, ids.previewCanvas.height);
+    const delayMs = Number(result.delays[index]) * 1000;
+    index = (index + 1) % images.length;
+
+    if (images.length > 1) {
+      session.timer = setTimeout(showFrame, Math.max(16, delayMs || 100));
+    }
+  };
+
+  showFrame();
+  setStatus('success', `Showing renderer output (${images.length} frame${images.length === 1 ? '' : 's'}). Edit any setting to return to the live preview.`);
+}
+
 function drawPreview() {
   if (!appState) {
     return;
   }
 
+  stopRendererPreview();
+
   syncStateFromForm();
 
   const w = ids.previewCanvas.width;
@@ -812,14 +1139,7 @@ function drawPreview() {
   previewCtx.fillRect(0, 0, w, h);
 
   if (activeTab === 'pixels') {
-    ensurePixels();
-    for (let y = 0; y < BOARD_HEIGHT; y += 1) {
-      for (let x = 0; x < BOARD_WIDTH; x += 1) {
-        const idx = y * BOARD_WIDTH + x;
-        previewCtx.fillStyle = appState.board.pixels.data[idx] || '#000000';
-        previewCtx.fillRect(x * sx, y * sy, sx, sy);
-      }
-    }
+    drawPixelPreview(w, h);
     return;
   }
 
@@ -875,6 +1195,7 @@ function setActiveTab(tabName) {
 }
 
 async function saveAll() {
+  await flushCalendarDay();
   syncStateFromForm();
   setStatus('working', 'Saving settings...');
   const saved = await api('/api/state', {
@@ -886,6 +1207,7 @@ async function saveAll() {
 }
 
 async function pushMode(mode) {
+  await flushCalendarDay();
   syncStateFromForm();
   appState.board.mode = mode;
   setStatus('working', `Sending ${mode} to the LED board...`);
@@ -894,11 +1216,20 @@ async function pushMode(mode) {
     method: 'POST',
     body: JSON.stringify({
       mode,
-      state: appState
+      state: appState,
+      force: true
     })
   });
 
-  setStatus('success', `${mode} is now running on the LED board.`);
+  const build = result.rendererBuild;
+  if (build && build.deployed !== build.expected) {
+    setStatus(
+      'success',
+      `${mode} is now running, but the Pi has renderer build ${build.deployed || 'unknown'} (expected ${build.expected}). Click Install Pi Script to update it.`
+    );
+  } else {
+    setStatus('success', `${mode} is now running on the LED board.`);
+  }
   return result;
 }
 
@@ -911,6 +1242,7 @@ async function pushModeSilently(mode) {
   appState.board.mode = mode;
 
   try {
+    await flushCalendarDay();
     await api('/api/board/push', {
       method: 'POST',
       body: JSON.stringify({
@@ -979,55 +1311,54 @@ async function refreshWeatherData({ showStatus = true, saveState = false, pushIf
   }
 }
 
-async function autoSyncCalendarFromCsv() {
-  const from = todayDateString();
-  const existing = Array.isArray(appState?.board?.widgets?.calendar?.events)
-    ? appState.board.widgets.calendar.events
-    : [];
-  const hasSeededFutureCsv = existing.some((event) => (
-    safeDate(event?.date) >= from && String(event?.source || '').toLowerCase() === 'csv'
-  ));
-
-  if (hasSeededFutureCsv) {
-    return 0;
+function describeCalendarSync(sync) {
+  if (!sync || sync.missing) {
+    return 'No schedule file found; add events by hand or import a CSV/ICS file.';
   }
-
-  const payload = await api(`/api/calendar/events?from=${encodeURIComponent(from)}`, {
-    method: 'GET'
-  });
-
-  const incoming = Array.isArray(payload.events) ? payload.events : [];
-  const merged = mergeCalendarEvents(existing, incoming);
-
-  appState.board.widgets.calendar.events = merged.events;
-
-  if (merged.added > 0) {
-    const saved = await api('/api/state', {
-      method: 'PUT',
-      body: JSON.stringify(appState)
-    });
-    appState = saved;
+  if (!sync.changed) {
+    return `${sync.file} is unchanged since the last sync (${sync.total} events stored).`;
   }
-
-  return merged.added;
+  return `Synced ${sync.file}: ${sync.added} added, ${sync.updated} updated, ${sync.removed} removed` +
+    `${sync.conflicts ? `, ${sync.conflicts} kept as edited by hand` : ''}.`;
 }
 
-function setCalendarDay(value) {
+async function setCalendarDay(value) {
   if (!appState) {
     return;
   }
 
-  const previousDay = safeDate(appState.board.widgets.calendar.selectedDate) || todayDateString();
   const nextDay = safeDate(value) || todayDateString();
+  try {
+    // Save edits for the day currently in the list before switching views.
+    await flushCalendarDay();
+    ids.calendarDay.value = nextDay;
+    appState.board.widgets.calendar.selectedDate = nextDay;
+    await loadCalendarDay(nextDay);
+  } catch (error) {
+    ids.calendarImportStatus.textContent = `Calendar load failed: ${error.message}`;
+  }
+  drawPreview();
+}
 
-  // Persist edits for the day currently rendered in the list before switching views.
-  ids.calendarDay.value = previousDay;
-  appState.board.widgets.calendar.selectedDate = previousDay;
-  syncStateFromForm();
+async function importCalendarFile() {
+  const file = ids.calendarImportFile.files[0];
+  if (!file) {
+    ids.calendarImportStatus.textContent = 'Choose a .csv or .ics file to import.';
+    return;
+  }
 
-  ids.calendarDay.value = nextDay;
-  appState.board.widgets.calendar.selectedDate = nextDay;
-  renderCalendarEventsForSelectedDay();
+  const isIcs = /\.ics$/i.test(file.name) || file.type === 'text/calendar';
+  const result = await api('/api/calendar/import', {
+    method: 'POST',
+    headers: { 'Content-Type': isIcs ? 'text/calendar' : 'text/csv' },
+    body: await file.text()
+  });
+
+  ids.calendarImportStatus.textContent =
+    `Imported ${file.name}: ${result.added} added, ${result.updated} updated, ${result.unchanged} unchanged` +
+    `${result.conflicts ? `, ${result.conflicts} skipped (edited by hand)` : ''}. ${result.total} events stored.`;
+  ids.calendarImportFile.value = '';
+  await Promise.all([loadCalendarDay(calendarLoadedDay || todayDateString()), refreshUpcomingEvents()]);
   drawPreview();
 }
 
@@ -1049,6 +1380,10 @@ function startPreviewTicker() {
       return;
     }
 
+    if (rendererPreviewSession) {
+      return;
+    }
+
     if (activeTab === 'valentine' && appState.board.valentine?.fireworks) {
       valentinePreviewPhase = (valentinePreviewPhase + 1) % 240;
       drawPreview();
@@ -1056,6 +1391,99 @@ function startPreviewTicker() {
   }, 120);
 }
 
+function formatRenderHistogram(histogram) {
+  return Object.entries(histogram || {})
+    .filter(([, count]) => count > 0)
+    .map(([upper, count]) => `${upper === '+Inf' ? '>100' : `≤${upper}`}ms: ${count}`)
+    .join(', ');
+}
+
+function renderRendererStats(result) {
+  const mode = result.stats?.mode || '';
+  const current = mode ? result.stats?.modes?.[mode] : null;
+  const rows = [['Status', result.running ? `Running (${mode || 'unknown'})` : 'Stopped']];
+
+  if (current) {
+    rows.push(
+      ['FPS', String(current.fps)],
+      ['Frame time', `${current.renderMs.avg} ms avg / ${current.renderMs.max} ms max`],
+      ['Histogram', formatRenderHistogram(current.renderMs.histogram) || '--'],
+      ['SwapOnVSync', `${current.swapMs.avg} ms avg / ${current.swapMs.max} ms max`],
+      ['Sleep overshoot', `${current.sleepOvershootMs.avg} ms avg / ${current.sleepOvershootMs.max} ms max`],
+      ['CPU', `${current.cpuPercent}%`],
+      ['Memory', `${Math.round(current.rssKb / 1024)} MB`]
+    );
+    if (current.replay) {
+      rows.push(['Replay cache', `${current.replay.cached}/${current.replay.frames} frames (${current.replay.key.split(':').slice(0, 2).join(' ')})`]);
+    }
+    if (current.power) {
+      rows.push([
+        'Power profile',
+        current.power.blankSeconds
+          ? `Panel off, back in ${Math.ceil(current.power.blankSeconds / 60)} min`
+          : `Brightness ${current.power.brightness ?? '--'}%`
+      ]);
+    }
+    if (current.pipeline) {
+      rows.push([
+        'Render pipeline',
+        `${current.pipeline.ring}-frame ring, ${current.pipeline.dropped} dropped, ${current.pipeline.stalls} stalls`
+      ]);
+    }
+  }
+
+  for (const [name, entry] of Object.entries(result.stats?.modes || {})) {
+    if (name !== mode) {
+      rows.push([`Last ${name}`, `${entry.fps} fps, ${entry.renderMs.avg} ms avg`]);
+    }
+  }
+
+  ids.rendererStats.innerHTML = '';
+  for (const [label, value] of rows) {
+    const term = document.createElement('dt');
+    term.textContent = label;
+    const detail = document.createElement('dd');
+    detail.textContent = value;
+    ids.rendererStats.append(term, detail);
+  }
+
+  const updatedAt = Number(result.stats?.updatedAt);
+  ids.rendererStatsUpdated.textContent = Number.isFinite(updatedAt)
+    ? `Updated ${new Date(updatedAt * 1000).toLocaleTimeString()}`
+    : 'No stats reported yet.';
+}
+
+async function refreshRendererStats({ showStatus = false } = {}) {
+  try {
+    if (showStatus) {
+      setStatus('working', 'Fetching renderer stats from Pi...');
+    }
+    const result = await api('/api/board/stats', { method: 'GET' });
+    renderRendererStats(result);
+    if (showStatus) {
+      setStatus('success', 'Renderer stats updated.');
+    }
+  } catch (error) {
+    ids.rendererStatsUpdated.textContent = `Stats unavailable: ${error.message}`;
+    if (showStatus) {
+      setStatus('error', error.message);
+    }
+  }
+}
+
+function startRendererStatsPolling() {
+  if (rendererStatsTimer) {
+    return;
+  }
+
+  rendererStatsTimer = setInterval(() => {
+    // Each poll opens an SSH session, so skip it while the tab is in the background.
+    if (!document.hidden) {
+      refreshRendererStats();
+    }
+  }, 10000);
+}
+
 function startWeatherAutoUpdate() {
   if (weatherAutoTimer) {
     return;
@@ -1069,23 +1497,20 @@ function startWeatherAutoUpdate() {
 async function init() {
   setStatus('working', 'Loading saved settings...');
   appState = await api('/api/state');
-  let autoLoadedCount = 0;
+  populateFormFromState();
 
   try {
-    autoLoadedCount = await autoSyncCalendarFromCsv();
+    const [day] = await Promise.all([loadCalendarDay(ids.calendarDay.value), refreshUpcomingEvents()]);
+    ids.calendarImportStatus.textContent = describeCalendarSync(day.sync);
   } catch (error) {
-    ids.calendarImportStatus.textContent = `Calendar auto-sync failed: ${error.message}`;
+    ids.calendarImportStatus.textContent = `Calendar sync failed: ${error.message}`;
   }
 
-  populateFormFromState();
-  if (!ids.calendarImportStatus.textContent) {
-    ids.calendarImportStatus.textContent = autoLoadedCount > 0
-      ? `Auto-loaded ${autoLoadedCount} upcoming event${autoLoadedCount === 1 ? '' : 's'} from schedule.csv.`
-      : 'Calendar is up to date from schedule.csv.';
-  }
   drawPreview();
   startPreviewTicker();
   startWeatherAutoUpdate();
+  startRendererStatsPolling();
+  refreshRendererStats();
   refreshWeatherData({ showStatus: false, saveState: true, pushIfWidgets: false });
   setStatus('success', 'Ready. Update controls then click Show Current Tab on Board.');
 }
@@ -1121,6 +1546,14 @@ function registerEvents() {
     }
   });
 
+  ids.rendererPreview.addEventListener('click', async () => {
+    try {
+      await showRendererPreview();
+    } catch (error) {
+      setStatus('error', error.message);
+    }
+  });
+
   ids.testConnection.addEventListener('click', async () => {
     try {
       syncStateFromForm();
@@ -1139,16 +1572,23 @@ function registerEvents() {
     try {
       syncStateFromForm();
       setStatus('working', 'Installing remote renderer on Pi...');
-      await api('/api/pi/install', {
+      const result = await api('/api/pi/install', {
         method: 'POST',
         body: JSON.stringify({ pi: appState.pi })
       });
-      setStatus('success', 'Pi renderer script installed successfully.');
+      const detail = result.uploaded.length
+        ? `${result.uploaded.length} file(s) updated`
+        : 'already up to date';
+      setStatus('success', `Pi renderer build ${result.build} installed (${detail}).`);
     } catch (error) {
       setStatus('error', error.message);
     }
   });
 
+  ids.refreshStats.addEventListener('click', async () => {
+    await refreshRendererStats({ showStatus: true });
+  });
+
   ids.refreshWeather.addEventListener('click', async () => {
     await refreshWeatherData({ showStatus: true, saveState: true, pushIfWidgets: true });
   });
@@ -1205,8 +1645,15 @@ function registerEvents() {
         source: 'manual'
       }
     ]);
-    syncStateFromForm();
-    drawPreview();
+    markCalendarDirty();
+  });
+
+  ids.calendarImport.addEventListener('click', async () => {
+    try {
+      await importCalendarFile();
+    } catch (error) {
+      ids.calendarImportStatus.textContent = `Import failed: ${error.message}`;
+    }
   });
 
   ids.addTodo.addEventListener('click', () => {
@@ -1251,6 +1698,14 @@ function registerEvents() {
     ids.clockNightStart,
     ids.clockDayStart,
     ids.clockBrightness,
+    ids.powerEnabled,
+    ids.powerDayTime,
+    ids.powerNightTime,
+    ids.powerDayBrightness,
+    ids.powerNightBrightness,
+    ids.powerRamp,
+    ids.powerBlankStart,
+    ids.powerBlankEnd,
     ids.valentineQuestion,
     ids.brightness
   ].forEach((element) => {
@@ -1271,19 +1726,31 @@ function registerEvents() {
     ids.pixelErase.textContent = eraserActive ? 'Eraser On' : 'Eraser';
   });
 
+  ids.pixelLive.addEventListener('change', () => {
+    if (ids.pixelLive.checked) {
+      startLiveDraw();
+    } else {
+      stopLiveDraw();
+    }
+  });
+
   ids.pixelClear.addEventListener('click', () => {
-    appState.board.pixels.data = createEmptyPixels();
+    ensurePixels();
+    pixelData.fill(0);
+    pixelDataChanged = true;
+    queueLiveFill('#000000');
     drawPixelCanvas();
-    drawPreview();
   });
 
   ids.pixelFill.addEventListener('click', () => {
-    appState.board.pixels.data = Array.from(
-      { length: BOARD_WIDTH * BOARD_HEIGHT },
-      () => ids.pixelColor.value
-    );
+    ensurePixels();
+    const rgb = hexToRgb(ids.pixelColor.value);
+    for (let index = 0; index < pixelWidth * pixelHeight; index += 1) {
+      pixelData.set(rgb, index * 3);
+    }
+    pixelDataChanged = true;
+    queueLiveFill(ids.pixelColor.value);
     drawPixelCanvas();
-    drawPreview();
   });
 
   ids.pixelCanvas.addEventListener('pointerdown', (event) => {
@@ -1315,6 +1782,7 @@ function registerEvents() {
   });
 }
 
+drawPixelGrid();
 registerEvents();
 init().catch((error) => {
   setStatus('error', error.message);
@@ -72,6 +72,7 @@ def main() -> int:
         payload = {
             "mode": mode,
             "state": state,
+            "force": True,
         }
         result = http_json("POST", f"{base_url}/api/board/push", payload, headers)
     except error.HTTPError as err:
@@ -4,20 +4,31 @@ const crypto = require('crypto');
 const express = require('express');
 const path = require('path');
 
-const { getState, saveState, normalizeState } = require('./services/stateStore');
+const { deepMerge, getState, saveState, normalizeState } = require('./services/stateStore');
 const { buildPayload } = require('./services/payloadBuilder');
 const { getCurrentWeather } = require('./services/weatherService');
+const { renderPreview } = require('./services/previewService');
+const { attachLiveDraw } = require('./services/liveDrawService');
 const {
-  loadCsvEvents,
-  loadCsvEventsForDate,
-  loadCsvEventsFromDate,
-  normalizeDateInput
-} = require('./services/calendarService');
+  createPushTimer,
+  getRecentPushes,
+  renderPrometheusMetrics
+} = require('./services/metricsService');
+const { normalizeDateInput } = require('./services/calendarService');
+const {
+  UPCOMING_WINDOW_DAYS,
+  addDays,
+  importCalendarText,
+  listCalendarEvents,
+  replaceCalendarDay,
+  syncCalendarFile
+} = require('./services/calendarStore');
 const {
   testConnection,
   installPiScript,
   stopRenderer,
-  pushPayload
+  pushPayload,
+  fetchRendererStats
 } = require('./services/piClient');
 
 const PORT = Number(process.env.PORT) || 3000;
@@ -71,18 +82,24 @@ function requestAuth(res) {
   res.status(401).send('Authentication required');
 }
 
-if (BASIC_AUTH_USER && BASIC_AUTH_PASS) {
-  app.use((req, res, next) => {
-    const credentials = parseBasicAuth(req.headers.authorization);
-    if (!credentials) {
-      requestAuth(res);
-      return;
-    }
+function isAuthorized(req) {
+  if (!BASIC_AUTH_USER || !BASIC_AUTH_PASS) {
+    return true;
+  }
+
+  const credentials = parseBasicAuth(req.headers.authorization);
+  if (!credentials) {
+    return false;
+  }
 
-    const userOk = timingSafeEquals(credentials.username, BASIC_AUTH_USER);
-    const passOk = timingSafeEquals(credentials.password, BASIC_AUTH_PASS);
+  const userOk = timingSafeEquals(credentials.username, BASIC_AUTH_USER);
+  const passOk = timingSafeEquals(credentials.password, BASIC_AUTH_PASS);
+  return userOk && passOk;
+}
 
-    if (!userOk || !passOk) {
+if (BASIC_AUTH_USER && BASIC_AUTH_PASS) {
+  app.use((req, res, next) => {
+    if (!isAuthorized(req)) {
       requestAuth(res);
       return;
     }
@@ -146,6 +163,36 @@ function getNightKey(now, nowMinutes, nightStartMinutes, dayStartMinutes) {
   return localDateString(now);
 }
 
+async function runTimedPush(timer, state, mode, pushOptions = {}) {
+  timer.setMode(mode);
+  const getWeather = (options) => timer.span('weather', () => getCurrentWeather(options));
+  const payload = await timer.span('buildPayload', () => buildPayload(state, mode, getWeather));
+  const result = await timer.span('pushPayload', () => pushPayload(state.pi, payload, pushOptions));
+  timer.addStages('pushPayload', result.timings);
+  return { payload, result };
+}
+
+// Mirrors /api/board/push: a push that throws (an SSH connect failure, say) still counts as failed.
+async function runAutoPush(nextState, mode) {
+  const timer = createPushTimer('auto');
+  let timings = null;
+
+  try {
+    const { result } = await runTimedPush(timer, nextState, mode);
+    if (!result.started) {
+      console.error(`Auto ${mode} switch failed:`, result.stderr || result.stdout || 'No output');
+      return false;
+    }
+    await timer.span('saveState', () => saveState(nextState));
+    timings = timer.finish(true);
+    return true;
+  } finally {
+    if (!timings) {
+      timer.finish(false);
+    }
+  }
+}
+
 async function runAutoClockSchedule() {
   const now = new Date();
   const nowMinutes = now.getHours() * 60 + now.getMinutes();
@@ -195,13 +242,9 @@ async function runAutoClockSchedule() {
       }
     };
 
-    const payload = await buildPayload(nextState, 'clock', getCurrentWeather);
-    const result = await pushPayload(nextState.pi, payload);
-    if (!result.started) {
-      console.error('Auto clock switch failed:', result.stderr || result.stdout || 'No output');
+    if (!(await runAutoPush(nextState, 'clock'))) {
       return;
     }
-    await saveState(nextState);
     console.log(`[auto] Switched to clock mode at ${nightKey}`);
     return;
   }
@@ -224,13 +267,9 @@ async function runAutoClockSchedule() {
     }
   };
 
-  const payload = await buildPayload(nextState, 'widgets', getCurrentWeather);
-  const result = await pushPayload(nextState.pi, payload);
-  if (!result.started) {
-    console.error('Auto widgets switch failed:', result.stderr || result.stdout || 'No output');
+  if (!(await runAutoPush(nextState, 'widgets'))) {
     return;
   }
-  await saveState(nextState);
   console.log(`[auto] Switched to widgets mode at ${today}`);
 }
 
@@ -245,26 +284,6 @@ function startAutoClockSchedule() {
   }, 30000);
 }
 
-function isObject(value) {
-  return value !== null && typeof value === 'object' && !Array.isArray(value);
-}
-
-function deepMerge(base, override) {
-  if (!isObject(base) || !isObject(override)) {
-    return override;
-  }
-
-  const merged = { ...base };
-  for (const [key, value] of Object.entries(override)) {
-    if (isObject(value) && isObject(base[key])) {
-      merged[key] = deepMerge(base[key], value);
-      continue;
-    }
-    merged[key] = value;
-  }
-  return merged;
-}
-
 function asyncHandler(handler) {
   return async (req, res, next) => {
     try {
@@ -302,7 +321,8 @@ app.post(
   asyncHandler(async (req, res) => {
     const weather = await getCurrentWeather({
       city: req.body?.city,
-      unit: req.body?.unit
+      unit: req.body?.unit,
+      fresh: true
     });
 
     res.json(weather);
@@ -313,18 +333,26 @@ app.get(
   '/api/calendar/day',
   asyncHandler(async (req, res) => {
     const date = normalizeDateInput(req.query?.date);
-    const requestedFile = String(req.query?.file || 'schedule.csv').trim() || 'schedule.csv';
-    const filePath = path.isAbsolute(requestedFile)
-      ? requestedFile
-      : path.join(__dirname, requestedFile);
+    const sync = await syncCalendarFile();
+    const events = await listCalendarEvents(date, date);
+    res.json({
+      ok: true,
+      date,
+      events,
+      sync
+    });
+  })
+);
 
-    const calendar = await loadCsvEventsForDate(filePath, date);
+app.put(
+  '/api/calendar/day',
+  asyncHandler(async (req, res) => {
+    const date = normalizeDateInput(req.body?.date);
+    const events = await replaceCalendarDay(date, req.body?.events);
     res.json({
       ok: true,
-      date: calendar.date,
-      events: calendar.events,
-      totalEventsInFile: calendar.totalEventsInFile,
-      file: requestedFile
+      date,
+      events
     });
   })
 );
@@ -332,26 +360,38 @@ app.get(
 app.get(
   '/api/calendar/events',
   asyncHandler(async (req, res) => {
-    const date = normalizeDateInput(req.query?.from);
-    const requestedFile = String(req.query?.file || 'schedule.csv').trim() || 'schedule.csv';
     const includePast = String(req.query?.includePast || '').trim() === '1';
-    const filePath = path.isAbsolute(requestedFile)
-      ? requestedFile
-      : path.join(__dirname, requestedFile);
-
-    const calendar = includePast
-      ? {
-          date: '1900-01-01',
-          events: await loadCsvEvents(filePath)
-        }
-      : await loadCsvEventsFromDate(filePath, date);
+    const from = includePast ? '1900-01-01' : normalizeDateInput(req.query?.from);
+    const days = Math.min(3660, Math.max(1, Number.parseInt(req.query?.days, 10) || UPCOMING_WINDOW_DAYS));
+    const to = req.query?.to ? normalizeDateInput(req.query.to) : includePast ? '9999-12-31' : addDays(from, days - 1);
+    const sync = await syncCalendarFile();
+    const events = await listCalendarEvents(from, to);
 
     res.json({
       ok: true,
-      from: includePast ? '1900-01-01' : calendar.date,
-      events: calendar.events,
-      totalEventsInFile: includePast ? calendar.events.length : calendar.totalEventsInFile,
-      file: requestedFile
+      from,
+      to,
+      events,
+      sync
+    });
+  })
+);
+
+// Bulk import: the raw file as the body (text/csv or text/calendar), or JSON { format, text }.
+app.post(
+  '/api/calendar/import',
+  express.text({ type: ['text/csv', 'text/calendar', 'text/plain'], limit: '20mb' }),
+  asyncHandler(async (req, res) => {
+    const isText = typeof req.body === 'string';
+    const text = isText ? req.body : String(req.body?.text || '');
+    const requested = isText ? (req.is('text/calendar') ? 'ics' : 'csv') : String(req.body?.format || '');
+    const format = requested === 'ics' || /^\s*BEGIN:VCALENDAR/i.test(text) ? 'ics' : 'csv';
+
+    const result = await importCalendarText(text, format);
+    res.json({
+      ok: true,
+      format,
+      ...result
     });
   })
 );
@@ -400,45 +440,118 @@ app.post(
   })
 );
 
+app.get(
+  '/api/board/stats',
+  asyncHandler(async (_req, res) => {
+    const state = await getState();
+    const result = await fetchRendererStats(state.pi);
+
+    res.json({
+      ok: true,
+      running: result.running,
+      stats: result.stats
+    });
+  })
+);
+
 app.post(
   '/api/board/push',
   asyncHandler(async (req, res) => {
-    const current = await getState();
+    const timer = createPushTimer('api');
+    let timings = null;
+
+    try {
+      const current = await timer.span('getState', () => getState());
+
+      let candidateState = current;
+      if (req.body?.state) {
+        const merged = await timer.span('deepMerge', () => deepMerge(current, req.body.state));
+        candidateState = await timer.span('normalizeState', () => normalizeState(merged));
+      }
+
+      const mode = req.body?.mode || candidateState.board.mode;
+      candidateState.board.mode = mode;
+
+      const { payload, result } = await runTimedPush(timer, candidateState, mode, {
+        force: Boolean(req.body?.force)
+      });
+
+      if (!result.started) {
+        const detail = [result.stdout, result.stderr]
+          .filter(Boolean)
+          .join('\n')
+          .replace(/__STATUS__:(started|failed)/g, '')
+          .trim();
+
+        throw new Error(
+          `Pi renderer failed to start (status: ${result.status}). ${detail || 'No diagnostic output returned from Pi.'}`
+        );
+      }
+
+      await timer.span('saveState', () => saveState(candidateState));
+      timings = timer.finish(true);
+
+      res.json({
+        ok: true,
+        mode,
+        payload,
+        skipped: Boolean(result.skipped),
+        rendererBuild: result.build || null,
+        timings,
+        stdout: result.stdout,
+        stderr: result.stderr
+      });
+    } finally {
+      if (!timings) {
+        timer.finish(false);
+      }
+    }
+  })
+);
 
+app.post(
+  '/api/board/preview',
+  asyncHandler(async (req, res) => {
+    const current = await getState();
     const candidateState = req.body?.state
       ? normalizeState(deepMerge(current, req.body.state))
       : current;
 
     const mode = req.body?.mode || candidateState.board.mode;
-    candidateState.board.mode = mode;
-
     const payload = await buildPayload(candidateState, mode, getCurrentWeather);
-    const result = await pushPayload(candidateState.pi, payload);
-
-    if (!result.started) {
-      const detail = [result.stdout, result.stderr]
-        .filter(Boolean)
-        .join('\n')
-        .replace(/__STATUS__:(started|failed)/g, '')
-        .trim();
-
-      throw new Error(
-        `Pi renderer failed to start (status: ${result.status}). ${detail || 'No diagnostic output returned from Pi.'}`
-      );
-    }
-
-    await saveState(candidateState);
+    const preview = await renderPreview(payload, {
+      frames: req.body?.frames,
+      format: req.body?.format
+    });
 
     res.json({
       ok: true,
       mode,
-      payload,
-      stdout: result.stdout,
-      stderr: result.stderr
+      ...preview
     });
   })
 );
 
+app.get(
+  '/api/board/preview.png',
+  asyncHandler(async (req, res) => {
+    const state = await getState();
+    const mode = String(req.query?.mode || state.board.mode);
+    const payload = await buildPayload(state, mode, getCurrentWeather);
+    const preview = await renderPreview(payload, { frames: 1, format: 'png' });
+
+    res.type('image/png').send(Buffer.from(preview.frames[0], 'base64'));
+  })
+);
+
+app.get('/api/metrics', (_req, res) => {
+  res.type('text/plain; version=0.0.4').send(renderPrometheusMetrics());
+});
+
+app.get('/api/metrics/pushes', (_req, res) => {
+  res.json({ ok: true, pushes: getRecentPushes() });
+});
+
 app.use((error, _req, res, _next) => {
   const message = error?.message || 'Unknown server error';
   console.error(error);
@@ -448,7 +561,9 @@ app.use((error, _req, res, _next) => {
   });
 });
 
-app.listen(PORT, HOST, () => {
+const server = app.listen(PORT, HOST, () => {
   console.log(`LED board control app listening on http://${HOST}:${PORT}`);
   startAutoClockSchedule();
 });
+
+attachLiveDraw(server, { authorize: isAuthorized });
@@ -1,8 +1,5 @@
 'use strict';
 
-const fs = require('fs/promises');
-const path = require('path');
-
 function pad2(value) {
   return String(value).padStart(2, '0');
 }
@@ -154,35 +151,84 @@ function parseCsvEvents(csvText) {
   });
 }
 
-async function loadCsvEvents(filePath) {
-  const resolvedPath = path.resolve(filePath);
-  const raw = await fs.readFile(resolvedPath, 'utf8');
-  return parseCsvEvents(raw);
+function unfoldIcsLines(icsText) {
+  // Lines starting with a space or tab continue the previous one (RFC 5545 section 3.1).
+  return String(icsText || '')
+    .replace(/\r\n/g, '\n')
+    .replace(/\n[ \t]/g, '')
+    .split('\n');
 }
 
-async function loadCsvEventsForDate(filePath, dateInput) {
-  const date = normalizeDateInput(dateInput);
-  const events = await loadCsvEvents(filePath);
-  return {
-    date,
-    events: events.filter((event) => event.date === date),
-    totalEventsInFile: events.length
-  };
+function unescapeIcsText(value) {
+  return value.replace(/\\([nN,;\\])/g, (_match, char) => (char === 'n' || char === 'N' ? ' ' : char));
 }
 
-async function loadCsvEventsFromDate(filePath, dateInput) {
-  const date = normalizeDateInput(dateInput);
-  const events = await loadCsvEvents(filePath);
+// UTC stamps (trailing Z) are converted to server-local time; floating and TZID times are
+// taken as written, which is the board's wall clock for a schedule exported from the same place.
+function parseIcsDateTime(value) {
+  const match = String(value || '').trim().match(/^(\d{4})(\d{2})(\d{2})(?:T(\d{2})(\d{2})\d{0,2}(Z)?)?$/);
+  if (!match) {
+    return null;
+  }
+
+  const [, year, month, day, hour, minute, utc] = match;
+  if (!hour) {
+    return { date: `${year}-${month}-${day}`, time: '00:00' };
+  }
+
+  if (!utc) {
+    return { date: `${year}-${month}-${day}`, time: `${hour}:${minute}` };
+  }
+
+  const local = new Date(Date.UTC(Number(year), Number(month) - 1, Number(day), Number(hour), Number(minute)));
   return {
-    date,
-    events: events.filter((event) => event.date >= date),
-    totalEventsInFile: events.length
+    date: `${local.getFullYear()}-${pad2(local.getMonth() + 1)}-${pad2(local.getDate())}`,
+    time: `${pad2(local.getHours())}:${pad2(local.getMinutes())}`
   };
 }
 
+// Reads DTSTART and SUMMARY from each VEVENT. Recurrence rules are not expanded, so
+// exports should list each occurrence (most timetable exports already do).
+function parseIcsEvents(icsText) {
+  const events = [];
+  let current = null;
+
+  for (const line of unfoldIcsLines(icsText)) {
+    const separator = line.indexOf(':');
+    if (separator < 0) {
+      continue;
+    }
+
+    const name = line.slice(0, separator).split(';')[0].trim().toUpperCase();
+    const value = line.slice(separator + 1);
+
+    if (name === 'BEGIN' && value.trim().toUpperCase() === 'VEVENT') {
+      current = { start: null, title: '', cancelled: false };
+    } else if (!current) {
+      continue;
+    } else if (name === 'END' && value.trim().toUpperCase() === 'VEVENT') {
+      if (current.start && current.title && !current.cancelled) {
+        events.push({ ...current.start, title: current.title, source: 'ics' });
+      }
+      current = null;
+    } else if (name === 'DTSTART') {
+      current.start = parseIcsDateTime(value);
+    } else if (name === 'SUMMARY') {
+      current.title = unescapeIcsText(value).trim();
+    } else if (name === 'STATUS') {
+      current.cancelled = value.trim().toUpperCase() === 'CANCELLED';
+    }
+  }
+
+  return events.sort((a, b) => eventSortValue(a).localeCompare(eventSortValue(b)));
+}
+
+function parseCalendarText(text, format) {
+  return format === 'ics' ? parseIcsEvents(text) : parseCsvEvents(text);
+}
+
 module.exports = {
-  loadCsvEvents,
-  loadCsvEventsForDate,
-  loadCsvEventsFromDate,
-  normalizeDateInput
+  getTodayDateString,
+  normalizeDateInput,
+  parseCalendarText
 };
@@ -0,0 +1,288 @@
+'use strict';
+
+const fs = require('fs/promises');
+const path = require('path');
+const { parseCalendarText } = require('./calendarService');
+
+const CALENDAR_FILE = path.join(__dirname, '..', 'data', 'calendar.json');
+const SCHEDULE_FILE = path.join(__dirname, '..', 'schedule.csv');
+// Widget payloads carry at most this much of the calendar; the board only shows the next event.
+const UPCOMING_WINDOW_DAYS = 7;
+const MAX_UPCOMING_EVENTS = 48;
+
+// events stays sorted by slot key; slots indexes the same objects by key.
+let store = null;
+let loading = null;
+// Mutations run one at a time so a sync and an edit never interleave their writes.
+let queue = Promise.resolve();
+
+function slotKey(event) {
+  // Zero-padded YYYY-MM-DD|HH:MM keys sort chronologically as plain strings.
+  return `${event.date}|${event.time}`;
+}
+
+function sanitizeEvent(event, fallbackSource) {
+  const date = String(event?.date || '').trim();
+  const time = String(event?.time || '').trim();
+  const title = String(event?.title || '').trim().slice(0, 80);
+  if (!/^\d{4}-\d{2}-\d{2}$/.test(date) || !title) {
+    return null;
+  }
+
+  return {
+    date,
+    time: /^\d{2}:\d{2}$/.test(time) ? time : '00:00',
+    title,
+    source: String(event?.source || fallbackSource).trim().slice(0, 24) || fallbackSource
+  };
+}
+
+function addDays(date, days) {
+  const next = new Date(`${date}T00:00:00Z`);
+  next.setUTCDate(next.getUTCDate() + days);
+  return next.toISOString().slice(0, 10);
+}
+
+function lowerBound(events, key) {
+  let low = 0;
+  let high = events.length;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    if (slotKey(events[middle]) < key) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  return low;
+}
+
+function rebuildOrder() {
+  store.events = Array.from(store.slots.values()).sort((a, b) => {
+    const left = slotKey(a);
+    const right = slotKey(b);
+    return left < right ? -1 : left > right ? 1 : 0;
+  });
+}
+
+async function loadStore() {
+  let parsed = {};
+  try {
+    parsed = JSON.parse(await fs.readFile(CALENDAR_FILE, 'utf8'));
+  } catch (_error) {
+    parsed = {};
+  }
+
+  store = {
+    revision: Number(parsed.revision) || 0,
+    files: parsed.files && typeof parsed.files === 'object' ? parsed.files : {},
+    slots: new Map(),
+    events: []
+  };
+
+  for (const raw of Array.isArray(parsed.events) ? parsed.events : []) {
+    const event = sanitizeEvent(raw, 'manual');
+    if (event) {
+      store.slots.set(slotKey(event), event);
+    }
+  }
+  rebuildOrder();
+  return store;
+}
+
+function getStore() {
+  if (store) {
+    return Promise.resolve(store);
+  }
+  if (!loading) {
+    loading = loadStore();
+  }
+  return loading;
+}
+
+async function persist() {
+  store.revision += 1;
+  const body = JSON.stringify({ revision: store.revision, files: store.files, events: store.events });
+  const tempPath = `${CALENDAR_FILE}.${process.pid}.tmp`;
+  await fs.mkdir(path.dirname(CALENDAR_FILE), { recursive: true });
+  await fs.writeFile(tempPath, body);
+  await fs.rename(tempPath, CALENDAR_FILE);
+}
+
+function mutate(action) {
+  const run = queue.then(async () => {
+    await getStore();
+    return action();
+  });
+  queue = run.catch(() => {});
+  return run;
+}
+
+// Imports never overwrite a hand-edited (manual) event in the same slot; anything else is
+// replaced by the newer copy, so a corrected schedule file updates its earlier import.
+function mergeEvents(incoming, fallbackSource) {
+  const result = { added: 0, updated: 0, unchanged: 0, conflicts: 0, keys: new Set() };
+
+  for (const raw of incoming) {
+    const event = sanitizeEvent(raw, fallbackSource);
+    if (!event) {
+      continue;
+    }
+
+    const key = slotKey(event);
+    const existing = store.slots.get(key);
+    result.keys.add(key);
+
+    if (!existing) {
+      store.slots.set(key, event);
+      result.added += 1;
+    } else if (existing.source === 'manual' && event.source !== 'manual') {
+      result.conflicts += 1;
+    } else if (existing.title === event.title && existing.source === event.source) {
+      result.unchanged += 1;
+    } else {
+      store.slots.set(key, event);
+      result.updated += 1;
+    }
+  }
+
+  return result;
+}
+
+function summarize(result, extra = {}) {
+  return {
+    added: result.added,
+    updated: result.updated,
+    unchanged: result.unchanged,
+    conflicts: result.conflicts,
+    ...extra,
+    total: store.events.length,
+    revision: store.revision
+  };
+}
+
+function importCalendarText(text, format) {
+  return mutate(async () => {
+    const result = mergeEvents(parseCalendarText(text, format), format);
+    if (result.added || result.updated) {
+      rebuildOrder();
+      await persist();
+    }
+    return summarize(result);
+  });
+}
+
+// Re-reads a schedule file only when its mtime or size moved since the last sync. Events the
+// file used to list and no longer does are dropped, unless they were edited by hand since.
+function syncCalendarFile(filePath = SCHEDULE_FILE) {
+  return mutate(async () => {
+    const name = path.basename(filePath);
+    let stats;
+    try {
+      stats = await fs.stat(filePath);
+    } catch (error) {
+      if (error.code === 'ENOENT') {
+        return { file: name, changed: false, missing: true, total: store.events.length, revision: store.revision };
+      }
+      throw error;
+    }
+
+    const previous = store.files[name];
+    if (previous && previous.mtimeMs === stats.mtimeMs && previous.size === stats.size) {
+      return { file: name, changed: false, total: store.events.length, revision: store.revision };
+    }
+
+    const format = path.extname(name).toLowerCase() === '.ics' ? 'ics' : 'csv';
+    const text = await fs.readFile(filePath, 'utf8');
+    const result = mergeEvents(parseCalendarText(text, format), format);
+
+    let removed = 0;
+    for (const key of previous?.slots || []) {
+      const event = store.slots.get(key);
+      if (!result.keys.has(key) && event && event.source === format) {
+        store.slots.delete(key);
+        removed += 1;
+      }
+    }
+
+    store.files[name] = {
+      mtimeMs: stats.mtimeMs,
+      size: stats.size,
+      syncedAt: new Date().toISOString(),
+      slots: Array.from(result.keys)
+    };
+    rebuildOrder();
+    await persist();
+    return summarize(result, { file: name, changed: true, removed });
+  });
+}
+
+// Replaces everything on one day with the editor's rows for that day. A row that no longer
+// matches what was stored in its slot becomes manual, so the next import cannot undo the edit.
+function replaceCalendarDay(date, events) {
+  return mutate(async () => {
+    const previous = new Map();
+    for (const event of listRange(date, date)) {
+      previous.set(slotKey(event), event);
+      store.slots.delete(slotKey(event));
+    }
+    for (const raw of Array.isArray(events) ? events : []) {
+      const event = sanitizeEvent({ ...raw, date: raw?.date || date }, 'manual');
+      if (!event) {
+        continue;
+      }
+      const before = previous.get(slotKey(event));
+      if (!before || before.title !== event.title) {
+        event.source = 'manual';
+      }
+      store.slots.set(slotKey(event), event);
+    }
+    rebuildOrder();
+    await persist();
+    return listRange(date, date);
+  });
+}
+
+// Calendar events used to be kept in state.json; older installs hand them over once.
+function adoptLegacyEvents(events) {
+  return mutate(async () => {
+    const result = mergeEvents(Array.isArray(events) ? events : [], 'manual');
+    if (result.added || result.updated) {
+      rebuildOrder();
+      await persist();
+    }
+    return summarize(result);
+  });
+}
+
+function listRange(from, to) {
+  const start = lowerBound(store.events, `${from}|`);
+  const end = lowerBound(store.events, `${to}|~`);
+  return store.events.slice(start, end);
+}
+
+async function listCalendarEvents(from, to) {
+  await getStore();
+  return listRange(from, to);
+}
+
+async function upcomingCalendarEvents(from, days = UPCOMING_WINDOW_DAYS) {
+  await getStore();
+  return listRange(from, addDays(from, days - 1)).slice(0, MAX_UPCOMING_EVENTS);
+}
+
+async function calendarRevision() {
+  return (await getStore()).revision;
+}
+
+module.exports = {
+  UPCOMING_WINDOW_DAYS,
+  addDays,
+  adoptLegacyEvents,
+  calendarRevision,
+  importCalendarText,
+  listCalendarEvents,
+  replaceCalendarDay,
+  syncCalendarFile,
+  upcomingCalendarEvents
+};
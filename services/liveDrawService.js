@@ -0,0 +1,183 @@
+'use strict';
+
+const { deepMerge, getState, normalizeState } = require('./stateStore');
+const { buildPayload } = require('./payloadBuilder');
+const { pushPayload, forgetRunningPayload, openLiveChannel } = require('./piClient');
+const { WebSocketServer } = require('ws');
+
+const LIVE_DRAW_PATH = '/api/board/live';
+const LIVE_FLUSH_INTERVAL_MS = 25;
+// Caps a whole message, fragments included; a full 64x32 repaint is well under this.
+const LIVE_MAX_MESSAGE_BYTES = 1024 * 1024;
+
+function normalizeLiveColor(value) {
+  const text = String(value || '').trim().toLowerCase();
+  return /^#[0-9a-f]{6}$/.test(text) ? text.slice(1) : '';
+}
+
+function startLiveSession(connection) {
+  const pending = new Map();
+  let fillColor = '';
+  let channel = null;
+  // Set by the first start message; opening the Pi channel takes a while and repeats must not race it.
+  let startRequested = false;
+  let flushTimer = null;
+  let cellCount = 0;
+  let closed = false;
+
+  function send(message) {
+    connection.send(JSON.stringify(message));
+  }
+
+  // Coalesce everything painted since the last tick into one line for the renderer.
+  function flush() {
+    if (!channel || (!fillColor && !pending.size)) {
+      return;
+    }
+
+    const parts = [];
+    if (fillColor) {
+      parts.push(`*:${fillColor}`);
+    }
+    for (const [index, color] of pending) {
+      parts.push(`${index}:${color}`);
+    }
+
+    pending.clear();
+    fillColor = '';
+    channel.write(`${parts.join(' ')}\n`);
+  }
+
+  function stop() {
+    if (closed) {
+      return;
+    }
+    closed = true;
+    clearInterval(flushTimer);
+    flush();
+    if (channel) {
+      channel.close();
+    }
+  }
+
+  async function start(stateOverride) {
+    const saved = await getState();
+    let state = saved;
+    if (stateOverride && typeof stateOverride === 'object' && !Array.isArray(stateOverride)) {
+      // Unsaved board edits apply as in /api/board/push, but the Pi host and login always come
+      // from the saved state, never from the socket.
+      const { pi: _ignoredPi, ...override } = stateOverride;
+      state = normalizeState({ ...deepMerge(saved, override), pi: saved.pi });
+    }
+    cellCount = state.board.width * state.board.height;
+
+    const payload = await buildPayload(state, 'pixels');
+    const result = await pushPayload(state.pi, payload);
+    if (!result.started) {
+      throw new Error(`Pi renderer failed to start (status: ${result.status}).`);
+    }
+
+    const nextChannel = await openLiveChannel(state.pi);
+    if (closed) {
+      nextChannel.close();
+      return;
+    }
+
+    // The board is about to diverge from the pushed payload, so never skip the next push.
+    forgetRunningPayload(state.pi);
+    channel = nextChannel;
+    channel.onClose(() => {
+      if (!closed) {
+        send({ type: 'error', error: 'Live draw channel to the Pi closed.' });
+        connection.close();
+      }
+    });
+    flushTimer = setInterval(flush, LIVE_FLUSH_INTERVAL_MS);
+    send({ type: 'ready' });
+  }
+
+  connection.on('message', (text) => {
+    let message;
+    try {
+      message = JSON.parse(String(text));
+    } catch (_error) {
+      return;
+    }
+
+    if (message?.type === 'start' && !startRequested) {
+      startRequested = true;
+      start(message.state).catch((error) => {
+        send({ type: 'error', error: error.message });
+        connection.close(1011);
+      });
+      return;
+    }
+
+    if (message?.type === 'fill') {
+      const color = normalizeLiveColor(message.color);
+      if (color) {
+        pending.clear();
+        fillColor = color;
+      }
+      return;
+    }
+
+    if (message?.type === 'cells' && Array.isArray(message.cells)) {
+      for (const cell of message.cells) {
+        const index = Number(Array.isArray(cell) ? cell[0] : NaN);
+        const color = normalizeLiveColor(Array.isArray(cell) ? cell[1] : '');
+        if (Number.isInteger(index) && index >= 0 && (!cellCount || index < cellCount) && color) {
+          pending.set(index, color);
+        }
+      }
+    }
+  });
+
+  connection.on('close', stop);
+  // ws closes the socket itself after a protocol error (oversized or unmasked frames); an
+  // unhandled 'error' event would take the whole server down with it.
+  connection.on('error', () => {});
+}
+
+// WebSockets skip CORS, so without this any page a LAN user opens could paint the panel.
+// Browsers always send Origin on a WebSocket handshake; scripts that omit it are let through.
+function isSameOrigin(req) {
+  const origin = req.headers.origin;
+  if (!origin) {
+    return true;
+  }
+
+  try {
+    return new URL(origin).host.toLowerCase() === String(req.headers.host || '').toLowerCase();
+  } catch (_error) {
+    return false;
+  }
+}
+
+function attachLiveDraw(server, { authorize = () => true } = {}) {
+  const webSockets = new WebSocketServer({ noServer: true, maxPayload: LIVE_MAX_MESSAGE_BYTES });
+
+  server.on('upgrade', (req, socket, head) => {
+    const pathname = new URL(req.url, 'http://localhost').pathname;
+    if (pathname !== LIVE_DRAW_PATH) {
+      socket.destroy();
+      return;
+    }
+
+    if (!isSameOrigin(req)) {
+      socket.end('HTTP/1.1 403 Forbidden\r\n\r\n');
+      return;
+    }
+
+    if (!authorize(req)) {
+      socket.end('HTTP/1.1 401 Unauthorized\r\nWWW-Authenticate: Basic realm="Lyda Board Remote"\r\n\r\n');
+      return;
+    }
+
+    webSockets.handleUpgrade(req, socket, head, startLiveSession);
+  });
+}
+
+module.exports = {
+  attachLiveDraw
+};
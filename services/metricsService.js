@@ -0,0 +1,157 @@
+'use strict';
+
+const PUSH_HISTORY_LIMIT = 256;
+const QUANTILES = [0.5, 0.9, 0.99];
+
+const pushHistory = [];
+let pushHistoryIndex = 0;
+const pushTotals = new Map();
+
+function elapsedMs(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+function roundMs(value) {
+  return Math.round(value * 1000) / 1000;
+}
+
+function recordPush(entry) {
+  if (pushHistory.length < PUSH_HISTORY_LIMIT) {
+    pushHistory.push(entry);
+  } else {
+    pushHistory[pushHistoryIndex] = entry;
+  }
+  pushHistoryIndex = (pushHistoryIndex + 1) % PUSH_HISTORY_LIMIT;
+
+  const totalKey = `${entry.mode}|${entry.ok ? 'ok' : 'failed'}`;
+  pushTotals.set(totalKey, (pushTotals.get(totalKey) || 0) + 1);
+}
+
+function createPushTimer(source = 'api') {
+  const startedAt = new Date().toISOString();
+  const start = process.hrtime.bigint();
+  const stages = [];
+  let mode = 'unknown';
+
+  return {
+    setMode(value) {
+      mode = String(value || 'unknown');
+    },
+
+    async span(name, action) {
+      const stageStart = process.hrtime.bigint();
+      try {
+        return await action();
+      } finally {
+        stages.push({ name, ms: roundMs(elapsedMs(stageStart)) });
+      }
+    },
+
+    addStages(prefix, timings) {
+      for (const [name, ms] of Object.entries(timings || {})) {
+        if (Number.isFinite(ms)) {
+          stages.push({ name: `${prefix}.${name}`, ms: roundMs(ms) });
+        }
+      }
+    },
+
+    finish(ok) {
+      const timings = {
+        startedAt,
+        source,
+        mode,
+        ok: Boolean(ok),
+        totalMs: roundMs(elapsedMs(start)),
+        stages: [...stages]
+      };
+      recordPush(timings);
+      return timings;
+    }
+  };
+}
+
+function getRecentPushes() {
+  return [...pushHistory.slice(pushHistoryIndex), ...pushHistory.slice(0, pushHistoryIndex)];
+}
+
+function quantile(sortedValues, q) {
+  if (!sortedValues.length) {
+    return 0;
+  }
+  const index = Math.min(sortedValues.length - 1, Math.ceil(q * sortedValues.length) - 1);
+  return sortedValues[Math.max(0, index)];
+}
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+function formatLabels(labels) {
+  const parts = Object.entries(labels).map(([key, value]) => `${key}="${escapeLabel(value)}"`);
+  return `{${parts.join(',')}}`;
+}
+
+function appendSummary(lines, name, groups) {
+  for (const { labels, values } of groups.values()) {
+    const sorted = [...values].sort((a, b) => a - b);
+    for (const q of QUANTILES) {
+      lines.push(`${name}${formatLabels({ ...labels, quantile: q })} ${quantile(sorted, q) / 1000}`);
+    }
+    const sum = sorted.reduce((total, value) => total + value, 0);
+    lines.push(`${name}_sum${formatLabels(labels)} ${sum / 1000}`);
+    lines.push(`${name}_count${formatLabels(labels)} ${sorted.length}`);
+  }
+}
+
+function groupValue(groups, labels, value) {
+  const key = JSON.stringify(labels);
+  if (!groups.has(key)) {
+    groups.set(key, { labels, values: [] });
+  }
+  groups.get(key).values.push(value);
+}
+
+function renderPrometheusMetrics() {
+  const stageGroups = new Map();
+  const totalGroups = new Map();
+
+  for (const push of pushHistory) {
+    // Failed pushes stop early or hang on a timeout; they are counted in board_pushes_total only.
+    if (!push.ok) {
+      continue;
+    }
+    groupValue(totalGroups, { mode: push.mode }, push.totalMs);
+    for (const stage of push.stages) {
+      groupValue(stageGroups, { stage: stage.name, mode: push.mode }, stage.ms);
+    }
+  }
+
+  const lines = [
+    `# HELP board_push_duration_seconds Total /api/board/push latency of successful pushes among the last ${PUSH_HISTORY_LIMIT}.`,
+    '# TYPE board_push_duration_seconds summary'
+  ];
+  appendSummary(lines, 'board_push_duration_seconds', totalGroups);
+
+  lines.push(
+    `# HELP board_push_stage_duration_seconds Push pipeline stage latency of successful pushes among the last ${PUSH_HISTORY_LIMIT}.`,
+    '# TYPE board_push_stage_duration_seconds summary'
+  );
+  appendSummary(lines, 'board_push_stage_duration_seconds', stageGroups);
+
+  lines.push(
+    '# HELP board_pushes_total Board pushes since the server started.',
+    '# TYPE board_pushes_total counter'
+  );
+  for (const [key, count] of pushTotals) {
+    const [mode, result] = key.split('|');
+    lines.push(`board_pushes_total${formatLabels({ mode, result })} ${count}`);
+  }
+
+  return `${lines.join('\n')}\n`;
+}
+
+module.exports = {
+  createPushTimer,
+  getRecentPushes,
+  renderPrometheusMetrics
+};
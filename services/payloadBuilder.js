@@ -1,5 +1,13 @@
 'use strict';
 
+const crypto = require('crypto');
+const { getTodayDateString } = require('./calendarService');
+const { calendarRevision, syncCalendarFile, upcomingCalendarEvents } = require('./calendarStore');
+
+const PAYLOAD_CACHE_LIMIT = 16;
+const payloadCache = new Map();
+const encodedPayloads = new WeakMap();
+
 function clampNumber(value, min, max, fallback) {
   const number = Number(value);
   if (!Number.isFinite(number)) {
@@ -9,11 +17,11 @@ function clampNumber(value, min, max, fallback) {
 }
 
 function sortEvents(events) {
-  return [...events].sort((a, b) => {
-    const aDate = new Date(`${a.date || ''}T${a.time || '00:00'}`);
-    const bDate = new Date(`${b.date || ''}T${b.time || '00:00'}`);
-    return aDate.getTime() - bDate.getTime();
-  });
+  // Zero-padded YYYY-MM-DDTHH:MM keys sort chronologically as plain strings.
+  return events
+    .map((event) => ({ key: `${event.date || ''}T${event.time || '00:00'}`, event }))
+    .sort((a, b) => (a.key < b.key ? -1 : a.key > b.key ? 1 : 0))
+    .map((entry) => entry.event);
 }
 
 function normalizeTodoItems(items) {
@@ -70,11 +78,8 @@ function buildMatrixOptions(state) {
   };
 }
 
-async function buildWidgetPayload(state, getWeather) {
-  const widgets = state.board.widgets || {};
-  const weatherWidget = widgets.weather || {};
-  const calendarWidget = widgets.calendar || {};
-  const todoWidget = widgets.todo || {};
+async function resolveWidgetWeather(state, getWeather) {
+  const weatherWidget = state.board.widgets?.weather || {};
 
   let weatherData = {
     city: weatherWidget.city,
@@ -98,7 +103,16 @@ async function buildWidgetPayload(state, getWeather) {
     }
   }
 
-  const events = normalizeCalendarEvents(calendarWidget.events);
+  return weatherData;
+}
+
+function buildWidgetPayload(state, weatherData, calendarEvents) {
+  const widgets = state.board.widgets || {};
+  const weatherWidget = widgets.weather || {};
+  const calendarWidget = widgets.calendar || {};
+  const todoWidget = widgets.todo || {};
+
+  const events = normalizeCalendarEvents(calendarEvents);
   const todoItems = normalizeTodoItems(todoWidget.items || []);
 
   return {
@@ -164,8 +178,8 @@ function buildPixelsPayload(state) {
     brightness: clampNumber(state.board.brightness, 10, 100, 70),
     matrixOptions: buildMatrixOptions(state),
     pixels: {
-      width: 64,
-      height: 32,
+      width: state.board.width,
+      height: state.board.height,
       data: state.board.pixels.data,
       background: state.board.pixels.background
     }
@@ -194,36 +208,122 @@ function buildClockPayload(state) {
   };
 }
 
-async function buildPayload(state, mode, getWeather) {
-  const selectedMode = mode || state.board.mode;
+function minutesOfDay(value) {
+  const [hours, minutes] = String(value).split(':').map(Number);
+  return hours * 60 + minutes;
+}
 
-  if (selectedMode === 'widgets') {
-    return buildWidgetPayload(state, getWeather);
+// Times go to the renderer as minutes past midnight, so it never parses strings per frame.
+function buildPowerPayload(state) {
+  const profile = state.board.powerProfile;
+  if (!profile?.enabled || (!profile.levels.length && !profile.blank.length)) {
+    return null;
   }
 
-  if (selectedMode === 'message') {
-    return buildMessagePayload(state);
+  return {
+    rampMinutes: profile.rampMinutes,
+    levels: profile.levels.map((level) => ({
+      minute: minutesOfDay(level.time),
+      brightness: level.brightness
+    })),
+    blank: profile.blank.map((window) => ({
+      start: minutesOfDay(window.start),
+      end: minutesOfDay(window.end)
+    }))
+  };
+}
+
+const PAYLOAD_BUILDERS = {
+  widgets: buildWidgetPayload,
+  message: buildMessagePayload,
+  animation: buildAnimationPayload,
+  pixels: buildPixelsPayload,
+  valentine: buildValentinePayload,
+  clock: buildClockPayload
+};
+
+function payloadSource(state, mode) {
+  const board = state.board;
+  const sources = {
+    widgets: () => board.widgets,
+    message: () => board.message,
+    animation: () => board.animation,
+    pixels: () => board.pixels,
+    valentine: () => board.valentine,
+    clock: () => null
+  };
+
+  return {
+    mode,
+    brightness: board.brightness,
+    matrixOptions: state.pi.matrixOptions,
+    powerProfile: board.powerProfile,
+    board: sources[mode]()
+  };
+}
+
+function hashContent(value) {
+  return crypto.createHash('sha256').update(JSON.stringify(value)).digest('hex');
+}
+
+function rememberPayload(key, payload) {
+  payloadCache.set(key, payload);
+  if (payloadCache.size > PAYLOAD_CACHE_LIMIT) {
+    payloadCache.delete(payloadCache.keys().next().value);
   }
+}
 
-  if (selectedMode === 'animation') {
-    return buildAnimationPayload(state);
+// Cached payloads are shared between callers and must be treated as read-only.
+async function buildPayload(state, mode, getWeather) {
+  const selectedMode = mode || state.board.mode;
+  const builder = PAYLOAD_BUILDERS[selectedMode];
+
+  if (!builder) {
+    throw new Error(`Unsupported board mode: ${selectedMode}`);
   }
 
-  if (selectedMode === 'pixels') {
-    return buildPixelsPayload(state);
+  // Weather and the calendar window are resolved first so the key changes whenever the
+  // fetched conditions, the stored events or the day the window starts on do.
+  const weatherData = selectedMode === 'widgets' ? await resolveWidgetWeather(state, getWeather) : null;
+  let calendar = null;
+  if (selectedMode === 'widgets') {
+    await syncCalendarFile();
+    calendar = { from: getTodayDateString(), revision: await calendarRevision() };
   }
+  const key = hashContent({ source: payloadSource(state, selectedMode), weather: weatherData, calendar });
 
-  if (selectedMode === 'valentine') {
-    return buildValentinePayload(state);
+  const cached = payloadCache.get(key);
+  if (cached) {
+    payloadCache.delete(key);
+    payloadCache.set(key, cached);
+    return cached;
   }
 
-  if (selectedMode === 'clock') {
-    return buildClockPayload(state);
+  const calendarEvents = calendar ? await upcomingCalendarEvents(calendar.from) : null;
+  const payload = builder(state, weatherData, calendarEvents);
+  const power = buildPowerPayload(state);
+  if (power) {
+    payload.power = power;
   }
+  rememberPayload(key, payload);
+  return payload;
+}
 
-  throw new Error(`Unsupported board mode: ${selectedMode}`);
+function encodePayload(payload) {
+  let encoded = encodedPayloads.get(payload);
+  if (!encoded) {
+    const json = JSON.stringify(payload);
+    encoded = {
+      json,
+      base64: Buffer.from(json, 'utf8').toString('base64'),
+      hash: crypto.createHash('sha256').update(json).digest('hex')
+    };
+    encodedPayloads.set(payload, encoded);
+  }
+  return encoded;
 }
 
 module.exports = {
-  buildPayload
+  buildPayload,
+  encodePayload
 };
@@ -1,8 +1,25 @@
 'use strict';
 
+const crypto = require('crypto');
 const fs = require('fs/promises');
 const path = require('path');
 const { Client } = require('ssh2');
+const { encodePayload } = require('./payloadBuilder');
+
+const RENDERER_STATS_FILE = '/tmp/lrdigiboard-stats.json';
+const RENDERER_LIVE_FIFO = '/tmp/lrdigiboard-live.fifo';
+// Payloads go over SFTP rather than argv: a full-resolution pixels payload outgrows the
+// kernel's 128 KiB limit on a single argument.
+const RENDERER_PAYLOAD_FILE = '/tmp/lrdigiboard-payload.json';
+// remote_display.py is a launcher; its per-mode modules live in this package beside it.
+const RENDERER_PACKAGE = 'lrdigiboard';
+// Written into the package by installPiScript; holds the build id of the deployed files.
+const RENDERER_BUILD_FILE = 'BUILD';
+const LOCAL_RENDERER_SCRIPT = path.join(__dirname, '..', 'pi', 'remote_display.py');
+
+// Hash of the payload each renderer was last started with, keyed by rendererTarget().
+const runningPayloadHashes = new Map();
+const localRendererCache = new Map();
 
 function escapeSingleQuotes(value) {
   return String(value).replace(/'/g, "'\\''");
@@ -51,6 +68,10 @@ function resolvePiConfig(config) {
   };
 }
 
+function rendererTarget(config) {
+  return `${config.username}@${config.host}:${config.port}:${config.remoteScriptPath}`;
+}
+
 function withConnection(config, action) {
   return new Promise((resolve, reject) => {
     const conn = new Client();
@@ -124,46 +145,157 @@ async function testConnection(piConfig) {
   );
 }
 
-async function uploadFile(conn, localPath, remotePath) {
-  const content = await fs.readFile(localPath, 'utf8');
-  const quotedPath = `'${escapeSingleQuotes(remotePath)}'`;
-  const dir = remotePath.split('/').slice(0, -1).join('/') || '.';
-  const command = [
-    `mkdir -p '${escapeSingleQuotes(dir)}'`,
-    `cat > ${quotedPath} <<'PYFILE'`,
-    content,
-    'PYFILE',
-    `chmod +x ${quotedPath}`
-  ].join('\n');
-
-  await execOrThrow(conn, `bash -lc '${escapeSingleQuotes(command)}'`, 'Upload script');
+function hashContent(content) {
+  return crypto.createHash('sha256').update(content).digest('hex');
+}
+
+async function listRendererFiles(localScriptPath) {
+  const packageDir = path.join(path.dirname(localScriptPath), RENDERER_PACKAGE);
+  const names = (await fs.readdir(packageDir)).filter((name) => name.endsWith('.py')).sort();
+  return [
+    { localPath: localScriptPath, relativePath: path.basename(localScriptPath) },
+    ...names.map((name) => ({
+      localPath: path.join(packageDir, name),
+      relativePath: `${RENDERER_PACKAGE}/${name}`
+    }))
+  ];
+}
+
+// Hashes every renderer file; the build id is a hash of those hashes, so any edit changes it.
+// Results are reused until a file's size or mtime changes, so pushes do not re-read the tree.
+async function describeLocalRenderer(localScriptPath = LOCAL_RENDERER_SCRIPT) {
+  const files = await listRendererFiles(localScriptPath);
+  const stats = await Promise.all(files.map((file) => fs.stat(file.localPath)));
+  const signature = files
+    .map((file, index) => `${file.relativePath}:${stats[index].size}:${stats[index].mtimeMs}`)
+    .join('|');
+
+  const cached = localRendererCache.get(localScriptPath);
+  if (cached && cached.signature === signature) {
+    return cached.renderer;
+  }
+
+  const hashed = await Promise.all(
+    files.map(async (file) => ({ ...file, sha256: hashContent(await fs.readFile(file.localPath)) }))
+  );
+  const renderer = {
+    build: hashContent(hashed.map((file) => `${file.relativePath}\0${file.sha256}\n`).join('')).slice(0, 12),
+    files: hashed
+  };
+
+  localRendererCache.set(localScriptPath, { signature, renderer });
+  return renderer;
+}
+
+function openSftp(conn) {
+  return new Promise((resolve, reject) => {
+    conn.sftp((error, sftp) => (error ? reject(error) : resolve(sftp)));
+  });
+}
+
+function sftpCall(sftp, method, ...args) {
+  return new Promise((resolve, reject) => {
+    sftp[method](...args, (error) => (error ? reject(error) : resolve()));
+  });
+}
+
+// Writes next to the target and renames over it, so a launch never sees a half-written file.
+async function uploadAtomically(sftp, source, remotePath, mode) {
+  const tempPath = `${remotePath}.upload-${process.pid}`;
+  if (Buffer.isBuffer(source)) {
+    await sftpCall(sftp, 'writeFile', tempPath, source);
+  } else {
+    await sftpCall(sftp, 'fastPut', source, tempPath);
+  }
+  await sftpCall(sftp, 'chmod', tempPath, mode);
+  // posix-rename@openssh.com replaces an existing target; plain SFTP rename refuses to.
+  await sftpCall(sftp, 'ext_openssh_rename', tempPath, remotePath);
+}
+
+function parseRemoteHashes(stdout) {
+  const hashes = new Map();
+  for (const line of stdout.split('\n')) {
+    const match = line.match(/^\\?([0-9a-f]{64}) [ *](.+)$/);
+    if (match) {
+      hashes.set(match[2], match[1]);
+    }
+  }
+  return hashes;
 }
 
-async function installPiScript(piConfig, localScriptPath) {
+async function installPiScript(piConfig, localScriptPath = LOCAL_RENDERER_SCRIPT) {
   const config = resolvePiConfig(piConfig);
+  const renderer = await describeLocalRenderer(localScriptPath);
+  const remoteDir = path.posix.dirname(config.remoteScriptPath);
+  const remotePackageDir = path.posix.join(remoteDir, RENDERER_PACKAGE);
+  const remoteBuildFile = path.posix.join(remotePackageDir, RENDERER_BUILD_FILE);
+  const py = escapeSingleQuotes(config.pythonCommand);
+  const sudoPrefix = config.useSudo ? 'sudo -n ' : '';
+
+  const files = renderer.files.map((file, index) => ({
+    ...file,
+    remotePath: index === 0 ? config.remoteScriptPath : path.posix.join(remoteDir, file.relativePath)
+  }));
+  const buildContent = Buffer.from(`${renderer.build}\n`);
+  const quotedPaths = [...files.map((file) => file.remotePath), remoteBuildFile]
+    .map((remotePath) => `'${escapeSingleQuotes(remotePath)}'`)
+    .join(' ');
 
   return withConnection(config, async (conn) => {
-    await uploadFile(conn, localScriptPath, config.remoteScriptPath);
-    const verify = await execOrThrow(
+    const existing = await execCommand(
       conn,
-      `bash -lc \"test -f '${escapeSingleQuotes(config.remoteScriptPath)}' && echo ok\"`,
-      'Verify uploaded script'
+      `bash -lc "mkdir -p '${escapeSingleQuotes(remotePackageDir)}' && sha256sum ${quotedPaths} 2>/dev/null; true"`
     );
+    const remoteHashes = parseRemoteHashes(existing.stdout);
+    const changed = files.filter((file) => remoteHashes.get(file.remotePath) !== file.sha256);
+    // A tree copied by hand or updated with git pull can match file for file yet carry a stale
+    // or missing BUILD, so the build id is compared on its own as well.
+    const buildStale = remoteHashes.get(remoteBuildFile) !== hashContent(buildContent);
+
+    if (changed.length || buildStale) {
+      const sftp = await openSftp(conn);
+      try {
+        for (const file of changed) {
+          await uploadAtomically(sftp, file.localPath, file.remotePath, file === files[0] ? 0o755 : 0o644);
+        }
+        // Written last, so the build id only names a tree that is fully in place.
+        await uploadAtomically(sftp, buildContent, remoteBuildFile, 0o644);
+      } finally {
+        sftp.end();
+      }
+    }
 
-    if (!verify.stdout.includes('ok')) {
-      throw new Error('Failed to verify remote script path after upload.');
+    if (changed.length) {
+      runningPayloadHashes.delete(rendererTarget(config));
+    }
+
+    // Compile the package now so the first launch after an update does not pay for it.
+    const compile = await execCommand(
+      conn,
+      `bash -lc "${sudoPrefix}${py} -m compileall -q '${escapeSingleQuotes(remotePackageDir)}' && cat '${escapeSingleQuotes(remoteBuildFile)}'"`
+    );
+    const deployedBuild = compile.stdout.trim();
+
+    if (deployedBuild !== renderer.build) {
+      throw new Error(
+        `Failed to verify renderer build ${renderer.build} on the Pi (found ${deployedBuild || 'none'}). ${compile.stderr}`.trim()
+      );
     }
 
     return {
       remoteScriptPath: config.remoteScriptPath,
-      stdout: verify.stdout,
-      stderr: verify.stderr
+      build: deployedBuild,
+      uploaded: changed.map((file) => file.relativePath),
+      unchanged: files.length - changed.length,
+      stdout: compile.stdout,
+      stderr: compile.stderr
     };
   });
 }
 
 async function stopRenderer(piConfig) {
   const config = resolvePiConfig(piConfig);
+  runningPayloadHashes.delete(rendererTarget(config));
   const processPattern = escapeSingleQuotes(buildProcessPattern(config.remoteScriptPath));
 
   return withConnection(config, (conn) =>
@@ -175,21 +307,67 @@ async function stopRenderer(piConfig) {
   );
 }
 
-async function pushPayload(piConfig, payload) {
+function elapsedMs(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+async function pushPayload(piConfig, payload, { force = false } = {}) {
   const config = resolvePiConfig(piConfig);
-  const payloadB64 = Buffer.from(JSON.stringify(payload), 'utf8').toString('base64');
+  const target = rendererTarget(config);
+  const timings = {};
+  let stageStart = process.hrtime.bigint();
+  const encoded = encodePayload(payload);
+  timings.encode = elapsedMs(stageStart);
 
   const py = escapeSingleQuotes(config.pythonCommand);
   const scriptPath = escapeSingleQuotes(config.remoteScriptPath);
   const processPattern = escapeSingleQuotes(buildProcessPattern(config.remoteScriptPath));
   const sudoPrefix = config.useSudo ? 'sudo -n ' : '';
+  const buildFile = escapeSingleQuotes(
+    path.posix.join(path.posix.dirname(config.remoteScriptPath), RENDERER_PACKAGE, RENDERER_BUILD_FILE)
+  );
+  const build = { expected: (await describeLocalRenderer()).build, deployed: '' };
+
+  // The map only says what this server last started; the renderer may since have crashed, been
+  // killed, or lost power, so a skip also needs pgrep to find it running with the same hash.
+  const mayBeRunning = !force && runningPayloadHashes.get(target) === encoded.hash;
 
+  stageStart = process.hrtime.bigint();
   return withConnection(config, async (conn) => {
+    timings.connect = elapsedMs(stageStart);
+
+    if (mayBeRunning) {
+      stageStart = process.hrtime.bigint();
+      const check = await execCommand(
+        conn,
+        `bash -lc "pgrep -f '${processPattern} --runner --payload-hash ${encoded.hash}' >/dev/null 2>&1 && echo __RUNNING__:yes"`
+      );
+      timings.verify = elapsedMs(stageStart);
+
+      if (check.stdout.includes('__RUNNING__:yes')) {
+        return {
+          exitCode: 0,
+          stdout: '',
+          stderr: '',
+          started: true,
+          skipped: true,
+          status: 'unchanged',
+          timings
+        };
+      }
+    }
+
+    runningPayloadHashes.delete(target);
+
+    stageStart = process.hrtime.bigint();
     const preflight = await execCommand(
       conn,
-      `bash -lc "${sudoPrefix}${py} -c 'import rgbmatrix; print(\"__RGBMATRIX__:ok\")'"`
+      `bash -lc "${sudoPrefix}${py} -c 'import rgbmatrix; print(\"__RGBMATRIX__:ok\")'; cat '${buildFile}' 2>/dev/null | sed 's/^/__BUILD__:/'"`
     );
 
+    timings.preflight = elapsedMs(stageStart);
+    build.deployed = (preflight.stdout.match(/__BUILD__:(\w+)/) || [])[1] || '';
+
     const preflightOut = [preflight.stdout, preflight.stderr].filter(Boolean).join('\n');
     if (!preflightOut.includes('__RGBMATRIX__:ok')) {
       return {
@@ -204,34 +382,60 @@ async function pushPayload(piConfig, payload) {
           .filter(Boolean)
           .join('\n'),
         started: false,
-        status: 'failed'
+        status: 'failed',
+        build,
+        timings
       };
     }
 
+    stageStart = process.hrtime.bigint();
+    const sftp = await openSftp(conn);
+    try {
+      await uploadAtomically(sftp, Buffer.from(encoded.json, 'utf8'), RENDERER_PAYLOAD_FILE, 0o600);
+    } finally {
+      sftp.end();
+    }
+
+    timings.upload = elapsedMs(stageStart);
+
+    stageStart = process.hrtime.bigint();
     const stopResult = await execCommand(
       conn,
       `bash -lc "pkill -f '${processPattern}' >/dev/null 2>&1 || true"`
     );
 
+    timings.stop = elapsedMs(stageStart);
+
+    stageStart = process.hrtime.bigint();
     const launchResult = await execCommand(
       conn,
-      `bash -lc "nohup ${sudoPrefix}${py} '${scriptPath}' --runner --payload-b64 '${payloadB64}' > /tmp/lrdigiboard.log 2>&1 < /dev/null & echo __LAUNCH__:ok"`
+      `bash -lc "nohup ${sudoPrefix}${py} '${scriptPath}' --runner --payload-hash ${encoded.hash} --payload-file '${RENDERER_PAYLOAD_FILE}' > /tmp/lrdigiboard.log 2>&1 < /dev/null & echo __LAUNCH__:ok"`
     );
 
+    timings.launch = elapsedMs(stageStart);
+
+    stageStart = process.hrtime.bigint();
     const probeResult = await execCommand(
       conn,
       `bash -lc "sleep 0.45; if pgrep -f '${processPattern}' >/dev/null 2>&1; then echo __STATUS__:started; else echo __STATUS__:failed; fi"`
     );
 
+    timings.probe = elapsedMs(stageStart);
+
     const started = [probeResult.stdout, probeResult.stderr]
       .filter(Boolean)
       .join('\n')
       .includes('__STATUS__:started');
 
+    if (started) {
+      runningPayloadHashes.set(target, encoded.hash);
+    }
+
     let status = started ? 'started' : 'failed';
     let diagResult = { stdout: '', stderr: '', exitCode: 0 };
 
     if (!started) {
+      stageStart = process.hrtime.bigint();
       diagResult = await execCommand(
         conn,
         `bash -lc "if [ -f /tmp/lrdigiboard.log ]; then tail -n 80 /tmp/lrdigiboard.log; else echo __LOG__:missing /tmp/lrdigiboard.log; fi"`
@@ -243,6 +447,7 @@ async function pushPayload(piConfig, payload) {
       if (!statusFromProbe.includes('__STATUS__:failed')) {
         status = 'unknown';
       }
+      timings.diagnostics = elapsedMs(stageStart);
     }
 
     return {
@@ -254,14 +459,118 @@ async function pushPayload(piConfig, payload) {
         .filter(Boolean)
         .join('\n'),
       started,
-      status
+      status,
+      build,
+      timings
+    };
+  });
+}
+
+async function fetchRendererStats(piConfig) {
+  const config = resolvePiConfig(piConfig);
+  const processPattern = escapeSingleQuotes(buildProcessPattern(config.remoteScriptPath));
+
+  return withConnection(config, async (conn) => {
+    const result = await execCommand(
+      conn,
+      `bash -lc "if pgrep -f '${processPattern}' >/dev/null 2>&1; then echo __RUNNING__:yes; fi; cat '${RENDERER_STATS_FILE}' 2>/dev/null"`
+    );
+
+    const running = result.stdout.includes('__RUNNING__:yes');
+    const raw = result.stdout.replace('__RUNNING__:yes', '').trim();
+    let stats = null;
+
+    if (raw) {
+      try {
+        stats = JSON.parse(raw);
+      } catch (_error) {
+        stats = null;
+      }
+    }
+
+    return {
+      running,
+      stats,
+      stderr: result.stderr
     };
   });
 }
 
+function forgetRunningPayload(piConfig) {
+  runningPayloadHashes.delete(rendererTarget(resolvePiConfig(piConfig)));
+}
+
+// Keeps one SSH exec open that feeds live-draw commands into the renderer's FIFO.
+function openLiveChannel(piConfig) {
+  const config = resolvePiConfig(piConfig);
+  const fifo = escapeSingleQuotes(RENDERER_LIVE_FIFO);
+  const sudoPrefix = config.useSudo ? 'sudo -n ' : '';
+  // dd with conv=nocreat avoids O_CREAT, which protected_fifos rejects for root-owned FIFOs in /tmp.
+  const command = [
+    `for attempt in 1 2 3 4 5 6 7 8 9 10; do [ -p '${fifo}' ] && break; sleep 0.1; done`,
+    `exec ${sudoPrefix}dd of='${fifo}' bs=4096 conv=nocreat status=none`
+  ].join('; ');
+
+  return new Promise((resolve, reject) => {
+    const conn = new Client();
+
+    conn
+      .on('ready', () => {
+        conn.exec(`bash -lc "${command}"`, (error, stream) => {
+          if (error) {
+            conn.end();
+            reject(error);
+            return;
+          }
+
+          let open = true;
+          const closeHandlers = [];
+
+          stream.on('close', () => {
+            open = false;
+            conn.end();
+            closeHandlers.forEach((handler) => handler());
+          });
+          stream.stderr.on('data', () => {});
+
+          resolve({
+            write(line) {
+              if (open) {
+                stream.write(line);
+              }
+            },
+            close() {
+              if (open) {
+                open = false;
+                stream.end();
+                conn.end();
+              }
+            },
+            onClose(handler) {
+              closeHandlers.push(handler);
+            }
+          });
+        });
+      })
+      .on('error', (error) => {
+        reject(error);
+      })
+      .connect({
+        host: config.host,
+        port: config.port,
+        username: config.username,
+        password: config.password,
+        readyTimeout: 10000
+      });
+  });
+}
+
 module.exports = {
   testConnection,
   installPiScript,
   stopRenderer,
-  pushPayload
+  pushPayload,
+  fetchRendererStats,
+  forgetRunningPayload,
+  openLiveChannel
 };
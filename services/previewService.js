@@ -0,0 +1,101 @@
+'use strict';
+
+const path = require('path');
+const { spawn } = require('child_process');
+const { encodePayload } = require('./payloadBuilder');
+
+const PREVIEW_SCRIPT = path.join(__dirname, '..', 'pi', 'remote_display.py');
+const PREVIEW_PYTHON = process.env.PREVIEW_PYTHON || 'python3';
+const PREVIEW_TIMEOUT_MS = 20000;
+const PREVIEW_MAX_FRAMES = 120;
+const PREVIEW_CACHE_LIMIT = 32;
+
+const previewCache = new Map();
+
+function clampFrames(value) {
+  const number = Number(value);
+  if (!Number.isFinite(number)) {
+    return 1;
+  }
+  return Math.min(PREVIEW_MAX_FRAMES, Math.max(1, Math.round(number)));
+}
+
+function previewTimeBucket(payload) {
+  // Widgets and clock draw the current time, so their frames only stay valid for a minute.
+  if (payload.mode === 'widgets' || payload.mode === 'clock') {
+    return new Date().toISOString().slice(0, 16);
+  }
+  return '';
+}
+
+function runHeadlessRenderer(payloadJson, frames, format) {
+  return new Promise((resolve, reject) => {
+    const child = spawn(
+      PREVIEW_PYTHON,
+      [PREVIEW_SCRIPT, '--headless', '--stdin', '--frames', String(frames), '--format', format],
+      { stdio: ['pipe', 'pipe', 'pipe'] }
+    );
+
+    const stdout = [];
+    let stderr = '';
+    const timer = setTimeout(() => {
+      child.kill('SIGKILL');
+    }, PREVIEW_TIMEOUT_MS);
+
+    child.stdout.on('data', (chunk) => {
+      stdout.push(chunk);
+    });
+
+    child.stderr.on('data', (chunk) => {
+      stderr += chunk.toString();
+    });
+
+    child.on('error', (error) => {
+      clearTimeout(timer);
+      reject(new Error(`Could not start preview renderer (${PREVIEW_PYTHON}): ${error.message}`));
+    });
+
+    child.on('close', (code, signal) => {
+      clearTimeout(timer);
+      if (code !== 0) {
+        const reason = signal ? `signal ${signal}` : `exit ${code}`;
+        reject(new Error(`Preview renderer failed (${reason}): ${stderr.trim() || 'No output'}`));
+        return;
+      }
+
+      try {
+        resolve(JSON.parse(Buffer.concat(stdout).toString('utf8')));
+      } catch (error) {
+        reject(new Error(`Preview renderer returned invalid output: ${error.message}`));
+      }
+    });
+
+    child.stdin.end(payloadJson);
+  });
+}
+
+async function renderPreview(payload, { frames = 1, format = 'png' } = {}) {
+  const frameCount = clampFrames(frames);
+  const frameFormat = format === 'rgb' ? 'rgb' : 'png';
+  const encoded = encodePayload(payload);
+  const key = `${encoded.hash}|${frameCount}|${frameFormat}|${previewTimeBucket(payload)}`;
+
+  const cached = previewCache.get(key);
+  if (cached) {
+    previewCache.delete(key);
+    previewCache.set(key, cached);
+    return { ...cached, cached: true };
+  }
+
+  const rendered = await runHeadlessRenderer(encoded.json, frameCount, frameFormat);
+  previewCache.set(key, rendered);
+  if (previewCache.size > PREVIEW_CACHE_LIMIT) {
+    previewCache.delete(previewCache.keys().next().value);
+  }
+
+  return { ...rendered, cached: false };
+}
+
+module.exports = {
+  renderPreview
+};
@@ -3,8 +3,11 @@
 const fs = require('fs/promises');
 const path = require('path');
 const { defaultState, createBlankPixels } = require('../data/defaultState');
+const { adoptLegacyEvents } = require('./calendarStore');
 
 const STATE_FILE = path.join(__dirname, '..', 'data', 'state.json');
+const MAX_BOARD_WIDTH = 512;
+const MAX_BOARD_HEIGHT = 192;
 
 function isObject(value) {
   return value !== null && typeof value === 'object' && !Array.isArray(value);
@@ -27,21 +30,72 @@ function deepMerge(base, override) {
   return merged;
 }
 
+function packHexPixels(pixels) {
+  const packed = Buffer.alloc(pixels.length * 3);
+  pixels.forEach((pixel, index) => {
+    const text = typeof pixel === 'string' ? pixel.trim() : '';
+    if (/^#[0-9A-Fa-f]{6}$/.test(text)) {
+      packed.writeUIntBE(parseInt(text.slice(1), 16), index * 3, 3);
+    }
+  });
+  return packed;
+}
+
+function resizePixels(packed, fromWidth, fromHeight, width, height) {
+  if (fromWidth === width && fromHeight === height) {
+    return packed;
+  }
+
+  // Keep the art anchored top-left; cells outside the new panel are dropped.
+  const resized = Buffer.alloc(width * height * 3);
+  const rowBytes = Math.min(fromWidth, width) * 3;
+  for (let y = 0; y < Math.min(fromHeight, height); y += 1) {
+    packed.copy(resized, y * width * 3, y * fromWidth * 3, y * fromWidth * 3 + rowBytes);
+  }
+  return resized;
+}
+
+// The last art string sanitizePixels produced. normalizeState runs several times per request
+// on the same data, and a string equal to this one is already canonical base64 of the right
+// length, so it is returned without decoding. A regex scan of the charset was tried first
+// and costs several times more than Node's native decode/encode round trip.
+let lastCanonicalPixels = null;
+
 function sanitizePixels(pixels, width, height) {
-  const expectedLength = width * height;
-  if (!Array.isArray(pixels) || pixels.length !== expectedLength) {
-    return createBlankPixels();
+  const data = pixels?.data;
+  let fromWidth = clampInteger(pixels?.width, 1, MAX_BOARD_WIDTH, 64);
+  let fromHeight = clampInteger(pixels?.height, 1, MAX_BOARD_HEIGHT, 32);
+  let packed = null;
+
+  // w*h*3 bytes is always a multiple of 3, so it encodes to exactly 4*w*h base64 chars.
+  if (
+    typeof data === 'string' &&
+    fromWidth === width &&
+    fromHeight === height &&
+    data.length === width * height * 4 &&
+    data === lastCanonicalPixels
+  ) {
+    return data;
   }
 
-  return pixels.map((pixel) => {
-    if (typeof pixel !== 'string') {
-      return '#000000';
-    }
+  if (typeof data === 'string') {
+    packed = Buffer.from(data, 'base64');
+  } else if (Array.isArray(data)) {
+    // Legacy format: one '#rrggbb' string per cell.
+    packed = packHexPixels(data);
+  }
 
-    const normalized = pixel.trim();
-    const isHex = /^#[0-9A-Fa-f]{6}$/.test(normalized);
-    return isHex ? normalized.toLowerCase() : '#000000';
-  });
+  if (packed && packed.length !== fromWidth * fromHeight * 3) {
+    // Older state files never stored the art size; assume it matched the board.
+    [fromWidth, fromHeight] = [width, height];
+  }
+
+  if (!packed || packed.length !== fromWidth * fromHeight * 3) {
+    return createBlankPixels(width, height);
+  }
+
+  lastCanonicalPixels = resizePixels(packed, fromWidth, fromHeight, width, height).toString('base64');
+  return lastCanonicalPixels;
 }
 
 function getTodayDateString() {
@@ -62,21 +116,6 @@ function sanitizeTime(value) {
   return /^\d{2}:\d{2}$/.test(text) ? text : '';
 }
 
-function sanitizeCalendarEvents(events) {
-  if (!Array.isArray(events)) {
-    return [];
-  }
-
-  return events
-    .map((event) => ({
-      date: sanitizeDate(event?.date, ''),
-      time: sanitizeTime(event?.time),
-      title: String(event?.title || '').trim().slice(0, 80),
-      source: String(event?.source || 'manual').trim().slice(0, 24) || 'manual'
-    }))
-    .filter((event) => event.date && event.title);
-}
-
 function sanitizeTodoItems(items) {
   if (!Array.isArray(items)) {
     return [];
@@ -89,6 +128,32 @@ function sanitizeTodoItems(items) {
     .filter((item) => item.text);
 }
 
+const MAX_POWER_LEVELS = 8;
+const MAX_BLANK_WINDOWS = 4;
+
+function sanitizePowerProfile(profile) {
+  const levels = (Array.isArray(profile?.levels) ? profile.levels : [])
+    .map((level) => ({
+      time: sanitizeTime(level?.time),
+      brightness: clampInteger(level?.brightness, 10, 100, 70)
+    }))
+    .filter((level) => level.time)
+    .sort((a, b) => (a.time < b.time ? -1 : a.time > b.time ? 1 : 0))
+    .slice(0, MAX_POWER_LEVELS);
+
+  const blank = (Array.isArray(profile?.blank) ? profile.blank : [])
+    .map((window) => ({ start: sanitizeTime(window?.start), end: sanitizeTime(window?.end) }))
+    .filter((window) => window.start && window.end && window.start !== window.end)
+    .slice(0, MAX_BLANK_WINDOWS);
+
+  return {
+    enabled: Boolean(profile?.enabled),
+    rampMinutes: clampInteger(profile?.rampMinutes, 0, 120, 30),
+    levels,
+    blank
+  };
+}
+
 function clampInteger(value, min, max, fallback) {
   const number = Number(value);
   if (!Number.isFinite(number)) {
@@ -153,8 +218,12 @@ function sanitizeMatrixOptions(matrixOptions) {
 
 function normalizeState(inputState) {
   const merged = deepMerge(defaultState, inputState || {});
-  merged.board.width = 64;
-  merged.board.height = 32;
+  merged.pi.matrixOptions = sanitizeMatrixOptions(merged.pi.matrixOptions);
+
+  // The board is whatever the chained/parallel panels add up to.
+  const matrix = merged.pi.matrixOptions;
+  merged.board.width = matrix.cols * matrix.chainLength;
+  merged.board.height = matrix.rows * matrix.parallel;
   merged.board.brightness = clampInteger(merged.board.brightness, 10, 100, 70);
   merged.board.dayBrightness = clampInteger(
     merged.board.dayBrightness,
@@ -168,10 +237,12 @@ function normalizeState(inputState) {
   };
 
   merged.board.pixels.data = sanitizePixels(
-    merged.board.pixels.data,
+    merged.board.pixels,
     merged.board.width,
     merged.board.height
   );
+  merged.board.pixels.width = merged.board.width;
+  merged.board.pixels.height = merged.board.height;
 
   const weather = merged.board.widgets.weather;
   weather.city = String(weather.city || '').trim();
@@ -182,7 +253,7 @@ function normalizeState(inputState) {
 
   const calendar = merged.board.widgets.calendar;
   calendar.selectedDate = sanitizeDate(calendar.selectedDate);
-  calendar.events = sanitizeCalendarEvents(calendar.events);
+  delete calendar.events;
 
   const todo = merged.board.widgets.todo;
   const allowedBullets = new Set(['dot', 'heart', 'star', 'diamond']);
@@ -204,8 +275,7 @@ function normalizeState(inputState) {
     dayStart: sanitizeTime(clockSchedule.dayStart) || '11:00',
     brightness: clampInteger(clockSchedule.brightness, 10, 100, 40)
   };
-
-  merged.pi.matrixOptions = sanitizeMatrixOptions(merged.pi.matrixOptions);
+  merged.board.powerProfile = sanitizePowerProfile(merged.board.powerProfile);
 
   return merged;
 }
@@ -231,6 +301,11 @@ async function getState() {
     parsed = {};
   }
 
+  const legacyEvents = parsed?.board?.widgets?.calendar?.events;
+  if (Array.isArray(legacyEvents)) {
+    await adoptLegacyEvents(legacyEvents);
+  }
+
   const normalized = normalizeState(parsed);
   await saveState(normalized);
   return normalized;
@@ -243,6 +318,7 @@ async function saveState(nextState) {
 }
 
 module.exports = {
+  deepMerge,
   getState,
   saveState,
   normalizeState
@@ -1,5 +1,8 @@
 'use strict';
 
+const WEATHER_CACHE_TTL_MS = 5 * 60 * 1000;
+const weatherCache = new Map();
+
 function normalizeUnit(unit) {
   return String(unit || 'F').toUpperCase() === 'C' ? 'C' : 'F';
 }
@@ -329,24 +332,17 @@ async function getWeatherFromWttr({ city, unit }) {
   };
 }
 
-async function getCurrentWeather({ city, unit }) {
-  const normalizedUnit = normalizeUnit(unit);
-  const location = canonicalizeLocation(city);
-
-  if (!location) {
-    throw new Error('City is required for weather lookup.');
-  }
-
+async function fetchCurrentWeather(location, unit) {
   try {
     return await getWeatherFromWttr({
       city: location,
-      unit: normalizedUnit
+      unit
     });
   } catch (wttrError) {
     try {
       return await getWeatherFromOpenMeteo({
         city: location,
-        unit: normalizedUnit
+        unit
       });
     } catch (openMeteoError) {
       throw new Error(
@@ -356,6 +352,27 @@ async function getCurrentWeather({ city, unit }) {
   }
 }
 
+async function getCurrentWeather({ city, unit, fresh = false }) {
+  const normalizedUnit = normalizeUnit(unit);
+  const location = canonicalizeLocation(city);
+
+  if (!location) {
+    throw new Error('City is required for weather lookup.');
+  }
+
+  // Short-lived cache so repeated pushes reuse the same reading (and payload cache key).
+  // fresh (an explicit refresh) skips the lookup but still stores what it fetched.
+  const cacheKey = `${location.toLowerCase()}|${normalizedUnit}`;
+  const cached = weatherCache.get(cacheKey);
+  if (!fresh && cached && Date.now() - cached.fetchedAt < WEATHER_CACHE_TTL_MS) {
+    return cached.weather;
+  }
+
+  const weather = await fetchCurrentWeather(location, normalizedUnit);
+  weatherCache.set(cacheKey, { weather, fetchedAt: Date.now() });
+  return weather;
+}
+
 module.exports = {
   getCurrentWeather
 };